@@ -22,10 +22,15 @@ from gui_framework.base_layouts import (
 	ZoomChild,
 	BaseText
 )
-from gui_framework.utils import RealWidget
+from gui_framework.utils import RealWidget, ColumnModel, group_max
+from gui_framework.text_metrics import text_metrics
+from gui_framework.data_containers import SparseData, DataView, iter_filled
+from gui_framework.loaders import DelimitedLoader
 
 from typing import List
 from copy import deepcopy
+from bisect import bisect_right
+from array import array
 
 
 """
@@ -47,6 +52,30 @@ propagated to them.
 Changelog:
 
 0.10.0 check if children are nested layouts themselves
+
+0.12.0 normalized data (see TODOs): leaf records can be stored once in a shared RecordStore, see
+BaseLayout.normalizeData
+
+0.13.0 batched relayout for rows and grids, see RowLayout.relayout and GridLayout.relayout
+
+0.14.0 column operations for all rows of a grid, see GridLayout.insertColumn, .deleteColumn and .moveColumn
+
+0.15.0 sparse cell storage: rows and grids without data store their cells / rows in data_containers.SparseData, empty
+children are not written back to data
+
+0.16.0 the rows of a grid share its col_widths, see utils.ColumnModel
+
+0.17.0 the grid decides the visible columns once per move for all rows, see GridLayout.get_col_window. New rows start
+filling at the left edge of the frame, see RowLayout.fillInFromScratch
+
+0.18.0 frozen rows and columns, see GridLayout.freezePanes
+
+0.19.0 streaming csv / tsv loader, see GridLayout.loadDelimited and loaders.DelimitedLoader
+
+0.20.0 auto size of all rows and columns, see GridLayout.autoSize. RowLayout.recalculate_max_child_height now reads the
+height of content_size (it used the width)
+
+0.21.0 fitting cells to their text, see CellWrapper.fitContentToText and GridLayout.fitToText
 """
 
 """
@@ -67,6 +96,7 @@ The current implementation stores all the children data in the sense that for n
 gets stored at every parent data, hence n times.
 
 ~> There needs to be some sort of mix between storing all the data and keeping a reference.
+=> done via data_containers.RecordStore, when calling normalizeData on the top most layout.
 """
 
 """
@@ -85,6 +115,7 @@ class NestedLayout(BaseLayout, BaseChild):
 		super(NestedLayout, self).__init__(**kwargs)
 		BaseChild.__init__(self, *args)
 		self.anchor = anchor
+		self.bindDirtyProperties()
 
 	def is_anchor(self):
 		return self.anchor is None
@@ -95,13 +126,48 @@ class NestedLayout(BaseLayout, BaseChild):
 		return self.anchor
 
 	def updateDataFromVisible(self):
+		"""
+		A nested child only needs to be written if it is dirty itself or if any of its (visible) children changed.
+
+		NOTE: child.to_data updates the childs data from its visible children as well. Since they are not dirty any more
+		at that point, the subtree only gets serialized once.
+		"""
+		changed = False
 		for child in self.visible:
-			child.updateDataFromVisible()
-			self.updateDataFromChild(child)
+			if child.updateDataFromVisible() or self.isChildDirty(child):
+				self.updateDataFromChild(child)
+				changed = True
+		return changed
+
+	def is_empty(self):
+		for data_index, raw_data in iter_filled(self.data):
+			return False
+		return True
+
+	def updateDataFromChild(self, child_widget):
+		"""
+		With sparse data, empty children are removed from data instead of being written.
+		"""
+		if not isinstance(self.data, SparseData) or not child_widget.is_empty():
+			super(NestedLayout, self).updateDataFromChild(child_widget)
+			return
+
+		data_index = child_widget.data_index
+		if self.data_store is not None:
+			self.data_store.discard(self.data[data_index])
+		self.data[data_index] = {}
+		child_widget.is_dirty = False
+		self.is_dirty = True
+
+	def normalizeData(self, data_store=None):
+		data_store = super(NestedLayout, self).normalizeData(data_store)
+		for child in self.visible:
+			child.normalizeData(data_store)
+		return data_store
 
 	def is_fully_visible(self, child_widget):
 		anchor = self.get_anchor()
-		anchor_pos = anchor.real_pos
+		anchor_pos = anchor.get_view_pos()
 		anchor_size = anchor.real_size
 
 		child_pos = child_widget.real_pos
@@ -129,7 +195,22 @@ class NestedMoveLayout(NestedLayout, MoveLayout):
 	def create_child(self, child_type, data_index, init_data):
 		#print(data_index)
 		new_child = child_type(data_index, **init_data)
-		new_child.fillInFromScratch()
+
+		# nested layouts share the recycle pool and the data store of their parent
+		new_child.recycle_pool = self.recycle_pool
+		if self.data_store is not None:
+			new_child.normalizeData(self.data_store)
+			if 'wrapped_data' in init_data:
+				# the wrapped data is a leaf record that now lives in the store, keep only the reference
+				del init_data['wrapped_data']
+				init_data['data'] = new_child.data
+
+		# when restoring a snapshot, the nested window is known already
+		window = self.pending_windows.get(data_index)
+		if window is None:
+			new_child.fillInFromScratch()
+		else:
+			new_child.restoreWindow(window)
 		return new_child
 
 	def reviewChildren(self):
@@ -187,23 +268,67 @@ class NestedMoveLayout(NestedLayout, MoveLayout):
 			if not self.is_fully_visible(child):
 				child.inspect(delta_x, delta_y)
 
+	def fillBudgetLeft(self):
+		"""
+		The fill budget belongs to the anchor, only the anchor needs to enable incremental fill. A nested layout that
+		runs out of budget gets completed by the anchors continueFill.
+		"""
+		if self.is_anchor():
+			return super(NestedMoveLayout, self).fillBudgetLeft()
+		return self.get_anchor().fillBudgetLeft()
+
+	def isFillIncremental(self):
+		return self.get_anchor().incremental_fill
+
+	def needsFillBudget(self):
+		if self.is_anchor():
+			return super(NestedMoveLayout, self).needsFillBudget()
+		return self.get_anchor().needsFillBudget()
+
+	def runBudgetedFill(self, fill, *args):
+		if self.is_anchor():
+			super(NestedMoveLayout, self).runBudgetedFill(fill, *args)
+		else:
+			self.get_anchor().runBudgetedFill(fill, *args)
+
+	def scheduleFill(self):
+		if self.is_anchor():
+			super(NestedMoveLayout, self).scheduleFill()
+		else:
+			self.get_anchor().scheduleFill()
+
+	def get_fill_frame(self):
+		anchor = self.get_anchor()
+		return anchor.get_view_pos(), anchor.real_size
+
+	def fillOnScreen(self):
+		# on screen slots of all levels come first, before any margins get filled
+		super(NestedMoveLayout, self).fillOnScreen()
+		for child in self.visible:
+			child.fillOnScreen()
+
+	def fillMargins(self):
+		super(NestedMoveLayout, self).fillMargins()
+		for child in self.visible:
+			child.fillMargins()
+
 
 class NestedVerticalLayout(NestedMoveLayout, VerticalLayout):
 	def delta_first(self, first_child):
 		anchor = self.get_anchor()
-		return (anchor.real_pos[1] + anchor.real_size[1]) - (first_child.real_pos[1] - first_child.real_size[1])
+		return (anchor.get_view_pos()[1] + anchor.real_size[1]) - (first_child.real_pos[1] - first_child.real_size[1])
 
 	def delta_last(self, last_child):
 		anchor = self.get_anchor()
-		return anchor.real_pos[1] - (last_child.real_pos[1] + 2 * last_child.real_size[1])
+		return anchor.get_view_pos()[1] - (last_child.real_pos[1] + 2 * last_child.real_size[1])
 
 	def delta_second(self, second_child):
 		anchor = self.get_anchor()
-		return (anchor.real_pos[1] + anchor.real_size[1]) - second_child.real_pos[1]
+		return (anchor.get_view_pos()[1] + anchor.real_size[1]) - second_child.real_pos[1]
 
 	def delta_penultimate(self, penultimate_child):
 		anchor = self.get_anchor()
-		return anchor.real_pos[1] - (penultimate_child.real_pos[1] + penultimate_child.real_size[1])
+		return anchor.get_view_pos()[1] - (penultimate_child.real_pos[1] + penultimate_child.real_size[1])
 
 	def checkDelta(self, delta_x, delta_y):
 		"""
@@ -221,19 +346,19 @@ class NestedVerticalLayout(NestedMoveLayout, VerticalLayout):
 class NestedHorizontalLayout(NestedMoveLayout, HorizontalLayout):
 	def delta_first(self, first_child):
 		anchor = self.get_anchor()
-		return anchor.real_pos[0] - (first_child.real_pos[0] + 2 * first_child.real_size[0])
+		return anchor.get_view_pos()[0] - (first_child.real_pos[0] + 2 * first_child.real_size[0])
 
 	def delta_last(self, last_child):
 		anchor = self.get_anchor()
-		return (anchor.real_pos[0] + anchor.real_size[0]) - (last_child.real_pos[0] - last_child.real_size[0])
+		return (anchor.get_view_pos()[0] + anchor.real_size[0]) - (last_child.real_pos[0] - last_child.real_size[0])
 
 	def delta_second(self, second_child):
 		anchor = self.get_anchor()
-		return anchor.real_pos[0] - (second_child.real_pos[0] + second_child.real_size[0])
+		return anchor.get_view_pos()[0] - (second_child.real_pos[0] + second_child.real_size[0])
 
 	def delta_penultimate(self, penultimate_child):
 		anchor = self.get_anchor()
-		return (anchor.real_pos[0] + anchor.real_size[0]) - penultimate_child.real_pos[0]
+		return (anchor.get_view_pos()[0] + anchor.real_size[0]) - penultimate_child.real_pos[0]
 
 	def checkDelta(self, delta_x, delta_y):
 		if self.is_anchor():
@@ -312,6 +437,9 @@ class ChildWrapper(NestedMoveLayout):
 				}
 			]
 
+			# the record of this wrapper within its parents data does not contain the new data yet
+			self.is_dirty = True
+
 	def create_child(self, child_type: ChildWidget, data_index, init_data):
 		return super(NestedMoveLayout, self).create_child(child_type, data_index, init_data)
 
@@ -354,6 +482,12 @@ class ChildWrapper(NestedMoveLayout):
 	def propagate_inspect(self, delta_x, delta_y):
 		pass
 
+	def fillOnScreen(self):
+		pass
+
+	def fillMargins(self):
+		pass
+
 	def delta_first(self, first_child):
 		return 0
 
@@ -367,7 +501,10 @@ class ChildWrapper(NestedMoveLayout):
 		return 0
 
 	def updateDataFromVisible(self):
-		super(NestedLayout, self).updateDataFromVisible()
+		return super(NestedLayout, self).updateDataFromVisible()
+
+	def normalizeData(self, data_store=None):
+		return super(NestedLayout, self).normalizeData(data_store)
 
 	def onTouchDownAnimation(self, touch):
 		if self.visible:
@@ -631,6 +768,7 @@ class CellWrapper(BaseTextWrapper):
 		if self.visible:
 			self.visible[0].updateData()
 			self.align_content()
+		self.is_dirty = True
 
 	def to_data(self) -> dict:
 		data = super(CellWrapper, self).to_data()
@@ -639,6 +777,37 @@ class CellWrapper(BaseTextWrapper):
 		data['init_data']['halign'] = self.halign
 		return data
 
+	@staticmethod
+	def get_wrapped_init_data(init_data) -> dict:
+		"""
+		The init_data of the wrapped child from the init_data of a CellWrapper record, whether it is still stored as
+		'wrapped_data' or already as 'data'.
+		"""
+		if init_data.get('wrapped_data'):
+			return init_data['wrapped_data']
+		data = init_data.get('data')
+		if data:
+			return data[0]['init_data']
+		return {}
+
+	def get_text_size(self) -> tuple:
+		if self.visible:
+			return self.visible[0].get_text_size()
+		init_data = self.data[0]['init_data']
+		return text_metrics.measure(init_data.get('this_text', ''), BaseText.get_data_font_size(init_data))
+
+	def fitContentToText(self, padding=(0,0)):
+		"""
+		Sets content_size to the size of the wrapped text plus padding, see text_metrics. Unlike with updateSize, the
+		content may exceed real_size afterwards; GridLayout.autoSize then grows the row and the column accordingly.
+		"""
+		if not self.data:
+			return
+		width, height = self.get_text_size()
+		self.content_size = [width + padding[0], height + padding[1]]
+		self.align_content()
+		self.is_dirty = True
+
 	def additionalKwargsInsert(self, data_index):
 		additional_data = super(CellWrapper, self).additionalKwargsInsert(data_index)
 		additional_data['real_size'] = self.content_size
@@ -658,18 +827,35 @@ class CellWrapper(BaseTextWrapper):
 class RowLayout(NestedHorizontalLayout):
 	"""
 	NOTE: Empty cells are allowed. Handling their onTouch* needs to be managed on implementation.
+
+	NOTE: Without data, the cells are stored sparsely (see data_containers.SparseData). Empty cells are read as
+	{'child_type': empty_cell_type, 'init_data': {}}, hence set empty_cell_type if empty cells should become visible as
+	(empty) widgets; with None they are read as {} like before.
+
+	NOTE: The cells of the first frozen_cols columns are pinned to the left edge of the anchors frame, see fillInFrozen.
+	They are not part of the scrolling cells (see get_first_index), hence every cell has exactly one widget.
 	"""
 	col_widths: List = []
-	def __init__(self, *args, col_widths=[], **kwargs):
+	empty_cell_type = None
+	frozen_cols = 0
+	def __init__(self, *args, col_widths=[], frozen_cols=0, **kwargs):
 		super(RowLayout, self).__init__(*args, **kwargs)
-		self.col_widths = deepcopy(col_widths)
+		if isinstance(col_widths, ColumnModel):
+			# shared with the grid (and its other rows)
+			self.col_widths = col_widths
+		else:
+			self.col_widths = ColumnModel(col_widths)
+		self.col_version = self.col_widths.version
+		self.frozen_cols = frozen_cols
+		self.frozen_visible = []
 		if not self.data:
-			self.data = [{} for i in range(len(self.col_widths))]
+			self.data = SparseData(len(self.col_widths), empty_record=self.get_empty_record())
+			self.is_dirty = True
 
-	def is_empty(self):
-		if [True for d in self.data if d]:
-			return False
-		return True
+	def get_empty_record(self):
+		if self.empty_cell_type is None:
+			return None
+		return {'child_type': self.empty_cell_type, 'init_data': {}}
 
 	def deleteWidget(self, data_index):
 		super(RowLayout, self).deleteWidget(data_index)
@@ -682,12 +868,113 @@ class RowLayout(NestedHorizontalLayout):
 		"""
 		self.updateDataFromVisible()
 		max_child_height = 0
-		for child in self.data:
-			content_size = child['init_data']['content_size']
-			if content_size[0] > max_child_height:
-				max_child_height = content_size[0]
+		for data_index, child in iter_filled(self.data):
+			# cells that have not been instantiated yet have no content_size, CellWrapper defaults it to real_size
+			init_data = child['init_data']
+			content_size = init_data.get('content_size', init_data.get('real_size'))
+			if content_size is None:
+				continue
+			if content_size[1] > max_child_height:
+				max_child_height = content_size[1]
 		self.updateHeight(max_child_height)
 
+	def fillInFromScratch(self):
+		"""
+		Starts at the column at the left edge of the anchors frame (bisected from the column offsets) instead of at the
+		first or last column. Otherwise a new row of a horizontally moved grid creates all cells left of the frame as well.
+		"""
+		if not self.data or not len(self.col_widths):
+			return
+
+		first_index = self.get_first_index()
+		if first_index < len(self.data):
+			offsets = self.col_widths.get_offsets()
+			left = self.get_anchor().get_view_pos()[0] - self.real_pos[0]
+			col_index = min(max(bisect_right(offsets, left) - 1, first_index), len(self.data) - 1)
+
+			additional_data = self.additionalKwargsInsert(col_index)
+			additional_data['real_pos'] = [self.real_pos[0] + offsets[col_index], self.real_pos[1]]
+			self.addWidget(col_index, additional_data)
+			self.fillInChildren()
+		if self.frozen_cols:
+			self.fillInFrozen()
+
+	def fillInFrozen(self):
+		"""
+		(Re)creates the cells of the frozen columns, pinned to the left edge of the anchors frame. They are not part of
+		visible, which only holds the scrolling cells. Hence the move pipeline does not touch them, they only follow the
+		vertical moves of the row (see updatePos).
+		"""
+		self.removeFrozen()
+		left = self.get_anchor().get_view_pos()[0]
+		for col_index in range(min(self.frozen_cols, len(self.data))):
+			raw_data = self.data[col_index]
+			if not raw_data:
+				continue
+			init_data = raw_data['init_data']
+			init_data.update(self.additionalKwargs(col_index))
+			init_data['real_size'] = [self.col_widths[col_index], self.real_size[1]]
+			init_data['real_pos'] = [left + self.col_widths.offset(col_index), self.real_pos[1]]
+			cell = self.create_child(raw_data['child_type'], col_index, init_data)
+			self.frozen_visible.append(cell)
+			self.add_widget(cell, canvas='after')
+
+	def get_first_index(self):
+		"""
+		The frozen columns are never filled in as scrolling cells.
+		"""
+		return min(self.frozen_cols, len(self.data))
+
+	def check_delta_left(self, first_child):
+		# the first scrolling cell stops at the right edge of the frozen cells
+		return super(RowLayout, self).check_delta_left(first_child) + self.col_widths.offset(self.get_first_index())
+
+	def refreezeCols(self, frozen_cols):
+		"""
+		Changes frozen_cols of a filled in row: the scrolling cells of newly frozen columns get removed, the cells of
+		unfrozen columns get filled in.
+		"""
+		self.frozen_cols = frozen_cols
+		first_index = self.get_first_index()
+		if self.visible and first_index < len(self.data):
+			last_col = max(self.visible[-1].data_index, first_index)
+			self.updateColWindow(max(self.visible[0].data_index, first_index), last_col)
+			self.fillInChildren()
+		elif first_index >= len(self.data):
+			for cell in self.visible.copy():
+				self.removeCell(cell)
+		else:
+			self.fillInFromScratch()
+		self.fillInFrozen()
+
+	def removeFrozen(self):
+		for cell in self.frozen_visible:
+			if cell.updateDataFromVisible() or self.isChildDirty(cell):
+				self.updateDataFromChild(cell)
+			self.remove_widget(cell)
+		self.frozen_visible = []
+
+	def updatePos(self, delta):
+		super(RowLayout, self).updatePos(delta)
+		if delta[0]:
+			# frozen cells stay at the left edge of the frame
+			for cell in self.frozen_visible:
+				cell.updatePos([-delta[0], 0])
+
+	def updateDataFromVisible(self):
+		changed = super(RowLayout, self).updateDataFromVisible()
+		for cell in self.frozen_visible:
+			if cell.updateDataFromVisible() or self.isChildDirty(cell):
+				self.updateDataFromChild(cell)
+				changed = True
+		return changed
+
+	def hitTestChildren(self, x, y) -> list:
+		for cell in self.frozen_visible:
+			if cell.collideWidget(x, y):
+				return [cell] + cell.hitTestChildren(x, y)
+		return super(RowLayout, self).hitTestChildren(x, y)
+
 	def createFirstHelperWidget(self):
 		real_pos = self.real_pos
 		real_size = [self.col_widths[0], self.real_size[1]]
@@ -711,6 +998,13 @@ class RowLayout(NestedHorizontalLayout):
 
 		return real_size
 
+	def get_data_real_size(self, data_index):
+		"""
+		The size of a cell is given by col_widths and the rows height. Empty cells of sparse data are read as fresh
+		copies, hence we cannot rely on their 'init_data'.
+		"""
+		return [self.col_widths[data_index], self.real_size[1]]
+
 	def additionalKwargsInsert(self, data_index):
 		real_size = self._add_real_size_for_kwargs(data_index)
 
@@ -738,10 +1032,32 @@ class RowLayout(NestedHorizontalLayout):
 		additional_data['real_size'] = real_size
 		return additional_data
 
+	def get_grid(self):
+		"""
+		Returns the grid this row shares col_widths with, None for a standalone row. Column operations of a shared row
+		have to go through the grid, otherwise the other rows would not follow the changed ColumnModel.
+		"""
+		anchor = self.get_anchor()
+		if anchor is not self and getattr(anchor, 'col_widths', None) is self.col_widths:
+			return anchor
+		return None
+
 	def insertNewAndReposition(self, data_index, new_data, child_type: ChildWidget):
+		"""
+		NOTE: Within a grid, the column gets inserted into all rows (see GridLayout.insertColumn), the other rows get an
+		empty cell of child_type.
+		"""
 		# NOTE: real_size has to be set in init_data
 		real_size = new_data['real_size']
+		grid = self.get_grid()
+		if grid is not None:
+			grid.insertColumn(
+				self.get_data_index(data_index), real_size[0], child_type=child_type, cell_data={self.data_index: new_data}
+			)
+			return
+
 		self.col_widths.insert(self.get_data_index(data_index), real_size[0])
+		self.col_version = self.col_widths.version
 
 		if real_size[1] > self.real_size[1]:
 			self.updateHeight(real_size[1])
@@ -776,9 +1092,20 @@ class RowLayout(NestedHorizontalLayout):
 				self.recalculate_max_child_height()
 
 	def updateColWidth(self, col_index, col_width, override_content_size=False):
+		"""
+		NOTE: Within a grid, all rows get updated, see GridLayout.updateColWidths.
+		"""
 		col_index = self.get_data_index(col_index)
+		grid = self.get_grid()
+		if grid is not None:
+			col_widths = list(self.col_widths)
+			col_widths[col_index] = col_width
+			grid.updateColWidths(col_widths, override_content_size=override_content_size)
+			return
+
 		delta = col_width - self.col_widths[col_index]
 		self.col_widths[col_index] = col_width
+		self.col_version = self.col_widths.version
 		cell = self.visible[self.get_visible_index(col_index)]
 		cell.override_content_size = override_content_size
 		cell.updateSize([col_width, self.real_size[1]])
@@ -793,27 +1120,307 @@ class RowLayout(NestedHorizontalLayout):
 		self.updatePos([0, delta])
 
 	def updateColWidths(self, col_widths, override_content_size=False):
-		for i in range(len(self.visible)):
-			cell = self.visible[i]
-			data_index = self.get_visible_index(cell.data_index)
-			self.updateColWidth(data_index, col_widths[data_index], override_content_size=override_content_size)
-		self.col_widths = deepcopy(col_widths)
-		self.updateSize([sum(self.col_widths), self.real_size[1]])
+		grid = self.get_grid()
+		if grid is not None:
+			grid.updateColWidths(col_widths, override_content_size=override_content_size)
+			return
+		self.relayout(col_widths=col_widths, override_content_size=override_content_size)
+
+	def relayout(self, col_widths=None, height=None, real_pos=None, override_content_size=False):
+		"""
+		Applies new col_widths, height and / or real_pos at once. The position of each cell follows from the cumulative
+		col_widths, hence every visible cell gets its final size and position assigned a single time (instead of
+		repositioning all following cells for each changed column, see updateColWidth).
+
+		NOTE: Without real_pos, the top of the row stays where it is (compare updateHeight).
+
+		NOTE: col_widths gets published to the shared ColumnModel, hence to all rows sharing it.
+		"""
+		if col_widths is not None and col_widths is not self.col_widths:
+			self.col_widths.set_widths(col_widths)
+		if height is None:
+			height = self.real_size[1]
+		if real_pos is None:
+			real_pos = [self.real_pos[0], self.real_pos[1] + self.real_size[1] - height]
+
+		for cell in self.visible:
+			col_index = self.get_data_index(cell.data_index)
+			cell.override_content_size = override_content_size
+			cell.updateSize([self.col_widths[col_index], height])
+			delta = [
+				real_pos[0] + self.col_widths.offset(col_index) - cell.real_pos[0],
+				real_pos[1] - cell.real_pos[1]
+			]
+			if delta[0] or delta[1]:
+				cell.updatePos(delta)
+
+		left = self.get_anchor().get_view_pos()[0]
+		for cell in self.frozen_visible:
+			col_index = cell.data_index
+			cell.override_content_size = override_content_size
+			cell.updateSize([self.col_widths[col_index], height])
+			cell.updatePos([
+				left + self.col_widths.offset(col_index) - cell.real_pos[0],
+				real_pos[1] - cell.real_pos[1]
+			])
+
+		# the cells are positioned already, hence no updatePos for the row itself
+		self.updateSize([self.col_widths.total(), height])
+		self.setPos(real_pos)
+		self.col_version = self.col_widths.version
+
+	def is_col_widths_published(self):
+		"""
+		Whether col_widths changed since this row got laid out the last time, i.e. the grid sharing col_widths with its
+		rows already published the column operation that the row is about to apply to its cells.
+		"""
+		return self.col_version != self.col_widths.version
+
+	def removeCell(self, cell):
+		"""
+		Removes a cell that moved out of sight. Unlike deleteWidget, its data stays, hence the height of the row does not
+		need to be recalculated.
+		"""
+		for child in cell.visible.copy():
+			cell.removeWidget(child)
+		if self.isChildDirty(cell):
+			self.updateDataFromChild(cell)
+		super(RowLayout, self).deleteWidget(cell)
+
+	def updateColWindow(self, first_col, last_col):
+		"""
+		Makes exactly the columns first_col to last_col visible, see GridLayout.get_col_window. Cells are only removed /
+		added at the edges, in case the current cells do not overlap the window at all, the row starts over from
+		first_col.
+
+		NOTE: Like inspect, this happens before the move, hence new cells get positioned relative to the current ones.
+		"""
+		if not self.visible:
+			return
+		first_index = self.get_first_index()
+		first_col = max(first_col, first_index)
+		last_col = max(last_col, first_index)
+
+		if self.visible[-1].data_index < first_col or last_col < self.visible[0].data_index:
+			first_cell = self.visible[0]
+			x = first_cell.real_pos[0] - self.col_widths.offset(first_cell.data_index)
+			for cell in self.visible.copy():
+				self.removeCell(cell)
+			additional_data = self.additionalKwargsInsert(first_col)
+			additional_data['real_pos'] = [x + self.col_widths.offset(first_col), self.real_pos[1]]
+			self.addWidget(first_col, additional_data)
+
+		while len(self.visible) > 1 and self.visible[0].data_index < first_col:
+			self.removeCell(self.visible[0])
+		while len(self.visible) > 1 and self.visible[-1].data_index > last_col:
+			self.removeCell(self.visible[-1])
+
+		first_cell = self.visible[0]
+		while first_cell.data_index > first_col and self.fillBudgetLeft():
+			data_index = first_cell.data_index - 1
+			self.addWidget(data_index, self.additionalKwargsFillFirst(data_index, first_cell))
+			first_cell = self.visible[0]
+		last_cell = self.visible[-1]
+		while last_cell.data_index < last_col and self.fillBudgetLeft():
+			data_index = last_cell.data_index + 1
+			self.addWidget(data_index, self.additionalKwargsFillLast(data_index, last_cell))
+			last_cell = self.visible[-1]
+
+	def insertColumn(self, col_index, col_width, raw_data):
+		"""
+		NOTE: This is the row part of GridLayout.insertColumn. Positions are not updated here, call relayout afterwards.
+		The frozen cells get removed, call fillInFrozen afterwards.
+		"""
+		self.removeFrozen()
+		if not self.is_col_widths_published():
+			self.col_widths.insert(col_index, col_width)
+		for child in self.visible:
+			if child.data_index >= col_index:
+				child.incrementIndex()
+		self.addData(col_index, raw_data)
+		self.is_dirty = True
+
+		# only create the cell if it lies within the visible cells, the edges are left to fillInChildren
+		if self.visible and self.visible[0].data_index < col_index < self.visible[-1].data_index:
+			self.insertWidget(col_index)
+
+	def deleteColumn(self, col_index):
+		"""
+		NOTE: This is the row part of GridLayout.deleteColumn. Positions are not updated here, call relayout afterwards.
+		The frozen cells get removed, call fillInFrozen afterwards.
+		"""
+		self.removeFrozen()
+		for child in self.visible.copy():
+			if child.data_index == col_index:
+				# the data gets removed anyway, no need to write it
+				super(RowLayout, self).deleteWidget(child)
+			elif child.data_index > col_index:
+				child.decrementIndex()
+		self.removeData(col_index)
+		if not self.is_col_widths_published():
+			self.col_widths.pop(col_index)
+		self.is_dirty = True
+
+	def moveColumn(self, from_index, to_index):
+		"""
+		NOTE: This is the row part of GridLayout.moveColumn. Positions are not updated here, call relayout afterwards.
+		The frozen cells get removed, call fillInFrozen afterwards.
+		"""
+		self.removeFrozen()
+		for child in self.visible.copy():
+			if child.data_index == from_index:
+				if self.isChildDirty(child):
+					self.updateDataFromChild(child)
+				super(RowLayout, self).deleteWidget(child)
+
+		self.data.insert(to_index, self.data.pop(from_index))
+		if not self.is_col_widths_published():
+			self.col_widths.insert(to_index, self.col_widths.pop(from_index))
+		if self.offset_index is not None:
+			self.offset_index.insert(to_index, self.offset_index.pop(from_index))
+		self.is_dirty = True
+
+		for child in self.visible:
+			if from_index < child.data_index <= to_index:
+				child.decrementIndex()
+			elif to_index <= child.data_index < from_index:
+				child.incrementIndex()
+
+		if self.visible and self.visible[0].data_index <= to_index <= self.visible[-1].data_index:
+			self.insertWidget(to_index)
 
 
 class GridLayout(NestedVerticalLayout):
 	"""
 	In data we store 
+
+	NOTE: Without data, the rows are stored sparsely (see data_containers.SparseData), empty rows are read as
+	{'child_type': empty_row_type, 'init_data': {}} ({} if None). Together with the sparse cells of RowLayout, only
+	non empty cells take up memory.
+
+	NOTE: Frozen rows and columns (see freezePanes) are not supported together with group translation, since they
+	would be translated along with the scrolling rows.
 	"""
 	grid_size = (0,0)
 	col_widths: List = []
 	row_heights: List = []
-	def __init__(self, *args, col_widths=[], row_heights=[], **kwargs):
+	snapshot_attributes: List = ['col_widths', 'row_heights']
+	empty_row_type = None
+	frozen_rows = 0
+	frozen_cols = 0
+	def __init__(self, *args, col_widths=[], row_heights=[], frozen_rows=0, frozen_cols=0, **kwargs):
 		super(GridLayout, self).__init__(*args, **kwargs)
-		self.col_widths = deepcopy(col_widths)
+		self.col_widths = ColumnModel(col_widths)
 		self.row_heights = deepcopy(row_heights)
+		self.frozen_rows = frozen_rows
+		self.frozen_cols = frozen_cols
+		self.frozen_visible = []
 		if not self.data:
-			self.data = [{} for i in range(len(self.row_heights))]
+			self.data = SparseData(len(self.row_heights), empty_record=self.get_empty_record())
+
+	def get_empty_record(self):
+		if self.empty_row_type is None:
+			return None
+		return {'child_type': self.empty_row_type, 'init_data': {}}
+
+	def freezePanes(self, frozen_rows=0, frozen_cols=0):
+		"""
+		Keeps the first frozen_rows rows at the top and the first frozen_cols columns at the left edge of the anchors
+		frame while the rest of the grid moves. Frozen rows are only virtualized horizontally (sharing the column window
+		of the other rows, see propagate_inspect), frozen columns only vertically (they exist for the visible rows only).
+		Passing 0 for both unfreezes the grid.
+		"""
+		self.removeFrozen()
+		self.frozen_rows = frozen_rows
+		self.frozen_cols = frozen_cols
+
+		# the scrolling rows start below the frozen ones now
+		first_index = self.get_first_index()
+		while self.visible and self.visible[0].data_index < first_index:
+			first_child = self.visible[0]
+			if len(self.visible) == 1 and first_index < len(self.data):
+				data_index = first_child.data_index + 1
+				self.addWidget(data_index, self.additionalKwargsFillLast(data_index, first_child))
+			self.removeWidget(first_child)
+
+		for row in self.visible:
+			row.refreezeCols(frozen_cols)
+		self.fillInChildren()
+		self.fillInFrozen()
+
+	def get_first_index(self):
+		"""
+		The frozen rows are never filled in as scrolling rows.
+		"""
+		return min(self.frozen_rows, len(self.data))
+
+	def get_frozen_height(self):
+		return sum(self.get_row_height(data_index) for data_index in range(self.get_first_index()))
+
+	def check_delta_top(self, first_child):
+		# the first scrolling row stops at the bottom edge of the frozen rows
+		return super(GridLayout, self).check_delta_top(first_child) - self.get_frozen_height()
+
+	def fillInFrozen(self):
+		"""
+		(Re)creates the frozen rows, pinned to the top of the anchors frame and horizontally aligned with the other rows.
+		Like the frozen cells of RowLayout, they are not part of visible (see get_first_index) and are drawn on top of the
+		scrolling rows.
+		"""
+		self.removeFrozen()
+		anchor = self.get_anchor()
+		view_pos = anchor.get_view_pos()
+		top = view_pos[1] + anchor.real_size[1]
+		x = self.visible[0].real_pos[0] if self.visible else view_pos[0]
+		for row_index in range(min(self.frozen_rows, len(self.data))):
+			top -= self.get_row_height(row_index)
+			raw_data = self.data[row_index]
+			if not raw_data:
+				continue
+			init_data = raw_data['init_data']
+			init_data.update(self.additionalKwargs(row_index))
+			init_data['real_size'] = self._add_real_size_for_kwargs(row_index)
+			init_data['real_pos'] = [x, top]
+			init_data['col_widths'] = self.col_widths
+			init_data['frozen_cols'] = self.frozen_cols
+			row = self.create_child(raw_data['child_type'], row_index, init_data)
+			self.frozen_visible.append(row)
+			self.add_widget(row, canvas='after')
+
+	def removeFrozen(self):
+		for row in self.frozen_visible:
+			if row.updateDataFromVisible() or self.isChildDirty(row):
+				self.updateDataFromChild(row)
+			self.remove_widget(row)
+		self.frozen_visible = []
+
+	def updateDataFromVisible(self):
+		changed = super(GridLayout, self).updateDataFromVisible()
+		for row in self.frozen_visible:
+			if row.updateDataFromVisible() or self.isChildDirty(row):
+				self.updateDataFromChild(row)
+				changed = True
+		return changed
+
+	def hitTestChildren(self, x, y) -> list:
+		for row in self.frozen_visible:
+			if row.collideWidget(x, y):
+				return [row] + row.hitTestChildren(x, y)
+		return super(GridLayout, self).hitTestChildren(x, y)
+
+	def move(self, touch):
+		deltas = super(GridLayout, self).move(touch)
+		if deltas is not None:
+			# frozen rows only follow horizontal moves
+			for row in self.frozen_visible:
+				row.updatePos([deltas[0], 0])
+		return deltas
+
+	def restoreState(self, data, window, state):
+		super(GridLayout, self).restoreState(data, window, state)
+		# snapshots store col_widths as a plain list
+		if not isinstance(self.col_widths, ColumnModel):
+			self.col_widths = ColumnModel(self.col_widths)
 
 	def get_cell_index(self, data_index):
 		"""
@@ -856,10 +1463,10 @@ class GridLayout(NestedVerticalLayout):
 		data_row_index = self.get_data_index(data_index[0])
 		if row.is_empty():
 			self.deleteWidget(row_index)
-		elif row.real_size[1] < self.row_heights[data_row_index]:
-			delta = row.real_size[1] - self.row_heights[data_row_index]
+		elif row.real_size[1] < self.get_row_height(data_row_index):
+			delta = row.real_size[1] - self.get_row_height(data_row_index)
 			self.repositionChildren(row, delta=delta)
-			self.row_heights[data_row_index] = row.real_size[1]
+			self.row_heights[self.get_row_index(data_row_index)] = row.real_size[1]
 
 	def _add_real_size_for_kwargs(self, data_index):
 		"""
@@ -870,7 +1477,7 @@ class GridLayout(NestedVerticalLayout):
 		we need to do so before calling the additionalKwargs* super methods. Since this is the same for all of them, we
 		extracted this logic to this separate method.
 		"""
-		real_size = [sum(self.col_widths), self.row_heights[data_index]]
+		real_size = [self.col_widths.total(), self.get_row_height(data_index)]
 
 		data_index = self.get_data_index(data_index)
 		raw_data = self.data[data_index]
@@ -878,11 +1485,35 @@ class GridLayout(NestedVerticalLayout):
 
 		return real_size
 
+	def get_data_real_size(self, data_index):
+		"""
+		See RowLayout.get_data_real_size.
+		"""
+		return [self.col_widths.total(), self.get_row_height(data_index)]
+
+	def get_row_index(self, data_index):
+		"""
+		row_heights is kept in the order of the underlying data, hence for sorted / filtered data (see
+		MoveLayout.sortData) data_index needs to be mapped first.
+		"""
+		if isinstance(self.data, DataView):
+			return self.data.source_index(data_index)
+		return data_index
+
+	def get_row_height(self, data_index):
+		return self.row_heights[self.get_row_index(data_index)]
+
 	def additionalKwargsInsert(self, data_index):
 		real_size = self._add_real_size_for_kwargs(data_index)
 
+		is_first_row = not self.visible
 		additional_data = super(GridLayout, self).additionalKwargsInsert(data_index)
 		additional_data['col_widths'] = self.col_widths
+		additional_data['frozen_cols'] = self.frozen_cols
+		if is_first_row and self.frozen_rows:
+			# the first scrolling row starts below the frozen rows
+			real_pos = additional_data['real_pos']
+			additional_data['real_pos'] = [real_pos[0], real_pos[1] - self.get_frozen_height()]
 
 		data_index = self.get_data_index(data_index)
 		additional_data['real_size'] = real_size
@@ -896,6 +1527,7 @@ class GridLayout(NestedVerticalLayout):
 
 		additional_data = super(GridLayout, self).additionalKwargsFillFirst(data_index, reference_child)
 		additional_data['col_widths'] = self.col_widths
+		additional_data['frozen_cols'] = self.frozen_cols
 
 		data_index = self.get_data_index(data_index)
 		additional_data['real_size'] = real_size
@@ -906,6 +1538,7 @@ class GridLayout(NestedVerticalLayout):
 
 		additional_data = super(GridLayout, self).additionalKwargsFillLast(data_index, reference_child)
 		additional_data['col_widths'] = self.col_widths
+		additional_data['frozen_cols'] = self.frozen_cols
 
 		data_index = self.get_data_index(data_index)
 		additional_data['real_size'] = real_size
@@ -914,36 +1547,125 @@ class GridLayout(NestedVerticalLayout):
 	def insertCellAndReposition(self, data_index, new_data, child_type: CellWrapper):
 		"""
 		This method inserts a cell into an existing row. All other rows will be inserted an empty cell at the same
-		position.
+		position, see insertColumn.
 		"""
-		visible_index = self.get_visible_cell_index(data_index)
-		row_index, col_index = visible_index
-		row = self.visible[row_index]
+		# NOTE: real_size has to be set in new_data
+		row_index, col_index = self.get_cell_index(data_index)
+		self.insertColumn(col_index, new_data['real_size'][0], child_type=child_type, cell_data={row_index: new_data})
 
-		# insert the widget
-		row.insertNewAndReposition(col_index, new_data, child_type)
+	def get_col_index(self, col_index):
+		if col_index < 0:
+			return len(self.col_widths) + col_index
+		return col_index
 
-		# if inserted widget has a greater height (in this case the row will have already adjusted its height during the
-		# insertion process), move rows below accordingly
-		data_row_index = self.get_data_index(data_index[0])
-		if row.real_size[1] > self.row_heights[data_row_index]:
-			delta = self.row_heights[data_row_index] - row.real_size[1]
-			self.repositionChildren(row, delta=[0, delta])
-			self.row_heights[data_row_index] = row.real_size[1]
-
-		# get col_index and col_width
-		col_index = row.get_data_index(col_index)
-		col_width = row.col_widths[col_index]
-
-		# first insert empty, then updateColWidth
-		for i in range(len(self.visible)):
-			if i == row_index:
+	def get_column_rows(self):
+		"""
+		Yields (row_index, row, cells) for all rows of data: row is the visible RowLayout or None, cells is the data of
+		the row if it is not visible. Empty rows are skipped.
+		"""
+		visible_rows = {row.data_index: row for row in self.visible}
+		filled_rows = {
+			data_index: raw_data for data_index, raw_data in iter_filled(self.data) if 'data' in raw_data['init_data']
+		}
+		for data_index in sorted(visible_rows.keys() | filled_rows.keys()):
+			if data_index in visible_rows:
+				yield data_index, visible_rows[data_index], None
 				continue
-			child = self.visible[i]
+			yield data_index, None, filled_rows[data_index]['init_data']['data']
 
-			# TODO: reposition will get called twice by that. If there is performance issues, this needs to be changed.
-			child.insertNewAndReposition(col_index, {}, child_type)
-			child.updateColWidth(col_index, col_width)
+	def insertColumn(self, col_index, col_width, child_type: CellWrapper = CellWrapper, init_data={}, cell_data={}):
+		"""
+		Inserts a column into all rows of data, not only the visible ones. Every row gets its own copy of init_data,
+		cell_data can provide init_data for specific rows (row data_index -> init_data).
+
+		col_widths, the data of all rows and the visible rows get updated in one pass. The visible cells are repositioned
+		once afterwards, see relayout.
+		"""
+		self.removeFrozen()
+		self.col_widths.insert(col_index, col_width)
+		for row_index, row, cells in self.get_column_rows():
+			# an inserted cell with a greater height grows its row
+			real_size = cell_data.get(row_index, {}).get('real_size')
+			if real_size is not None and real_size[1] > self.get_row_height(row_index):
+				self.row_heights[self.get_row_index(row_index)] = real_size[1]
+
+			if self.is_placeholder_cell(row_index, row, cells, child_type, init_data, cell_data):
+				raw_data = {}
+			else:
+				raw_data = self.formatData(deepcopy(cell_data.get(row_index, init_data)), child_type)
+				raw_data['init_data']['real_size'] = [col_width, self.get_row_height(row_index)]
+
+			if row is not None:
+				row.insertColumn(col_index, col_width, raw_data)
+			elif self.data_store is not None:
+				cells.insert(col_index, self.data_store.store(raw_data))
+			else:
+				cells.insert(col_index, raw_data)
+		self.relayoutColumns()
+
+	@staticmethod
+	def is_placeholder_cell(row_index, row, cells, child_type, init_data, cell_data):
+		"""
+		An empty cell does not need to be inserted as a record into sparse rows that read it as their empty cell anyway.
+		"""
+		if init_data or row_index in cell_data:
+			return False
+		if row is not None:
+			cells = row.data
+		if not isinstance(cells, SparseData) or cells.empty_record is None:
+			return False
+		return cells.empty_record['child_type'] is child_type
+
+	def deleteColumn(self, col_index):
+		col_index = self.get_col_index(col_index)
+		self.removeFrozen()
+		self.col_widths.pop(col_index)
+		for row_index, row, cells in self.get_column_rows():
+			if row is not None:
+				row.deleteColumn(col_index)
+				continue
+			raw_data = cells.pop(col_index)
+			if self.data_store is not None:
+				self.data_store.discard(raw_data)
+		self.relayoutColumns()
+
+	def moveColumn(self, from_index, to_index):
+		from_index = self.get_col_index(from_index)
+		to_index = self.get_col_index(to_index)
+		if from_index == to_index:
+			return
+		self.removeFrozen()
+		self.col_widths.insert(to_index, self.col_widths.pop(from_index))
+		for row_index, row, cells in self.get_column_rows():
+			if row is not None:
+				row.moveColumn(from_index, to_index)
+			else:
+				cells.insert(to_index, cells.pop(from_index))
+		self.relayoutColumns()
+
+	def relayoutColumns(self):
+		"""
+		Single reposition after a column operation, followed by filling in the cells that moved into sight.
+		"""
+		self.relayout(col_widths=self.col_widths, row_heights=self.row_heights)
+		for row in self.visible:
+			if row.visible:
+				row.fillInChildren()
+			else:
+				row.fillInFromScratch()
+			if row.frozen_cols:
+				row.fillInFrozen()
+		if self.frozen_rows:
+			self.fillInFrozen()
+
+	def loadDelimited(self, file_path, row_type, cell_type: CellWrapper = CellWrapper, **kwargs) -> DelimitedLoader:
+		"""
+		Appends the lines of a csv / tsv file as rows. The first chunk gets filled in right away, the rest is appended in
+		the background (one chunk per frame). See loaders.DelimitedLoader for the kwargs.
+
+		The returned loader can be used to cancel loading or to read the rest at once (loadAll).
+		"""
+		return DelimitedLoader(self, file_path, row_type, cell_type, **kwargs).start()
 
 	def updateCell(self, data_index, update_data):
 		visible_index = self.get_visible_cell_index(data_index)
@@ -956,23 +1678,183 @@ class GridLayout(NestedVerticalLayout):
 		We dont want to update real_size, since this serves as the frame of the grid and should not get fit to its
 		visible content.
 		"""
-		for row in self.visible:
-			row.updateColWidths(col_widths, override_content_size=override_content_size)
-		self.col_widths = deepcopy(col_widths)
-		self.calculate_max_child_width()
+		self.relayout(col_widths=col_widths, override_content_size=override_content_size)
 
 	def updateRowHeights(self, row_heights, override_content_size=False):
 		"""
 		We dont want to update real_size, since this serves as the frame of the grid and should not get fit to its
 		visible content.
 		"""
-		for i in range(len(self.visible)):
-			row = self.visible[i]
-			data_index = self.get_data_index(row.data_index)
-			delta = self.row_heights[data_index] - row_heights[data_index]
-			row.updateHeight(row_heights[data_index], override_content_size=override_content_size)
-			self.repositionChildren(row, delta=[0, delta])
-		self.row_heights = deepcopy(row_heights)
+		self.relayout(row_heights=row_heights, override_content_size=override_content_size)
+
+	def get_content_sizes(self):
+		"""
+		Returns the arrays row_indices, col_indices, widths and heights with one entry per measured cell of data,
+		including the rows that are not visible. Row indices refer to the underlying data (like row_heights).
+
+		NOTE: Cells that have never been instantiated (or fit, see fitToText) have no content_size and are skipped. Their
+		real_size is just the current column width and row height, counting it would keep autoSize from shrinking.
+
+		NOTE: This walks the records of all cells, which takes about a second per million cells and dominates autoSize.
+		"""
+		self.updateDataFromVisible()
+		source = self.data.data if isinstance(self.data, DataView) else self.data
+		row_indices = array('q')
+		col_indices = array('q')
+		widths = array('d')
+		heights = array('d')
+		for row_index, raw_data in iter_filled(source):
+			cells = raw_data['init_data'].get('data')
+			if not cells:
+				continue
+			for col_index, cell in iter_filled(cells):
+				init_data = cell['init_data']
+				content_size = init_data.get('content_size')
+				if content_size is None:
+					continue
+				row_indices.append(row_index)
+				col_indices.append(col_index)
+				widths.append(content_size[0])
+				heights.append(content_size[1])
+		return row_indices, col_indices, widths, heights
+
+	def autoSize(self, rows=True, cols=True):
+		"""
+		Fits every row to its highest cell and every column to its widest cell, off screen cells included. The maxima
+		are reduced in one pass over all cells (see utils.group_max), the result gets applied by a single relayout (see
+		relayoutColumns).
+		Rows and columns without any measured cells keep their size, see get_content_sizes.
+		"""
+		if not rows and not cols:
+			return
+		row_indices, col_indices, widths, heights = self.get_content_sizes()
+		if rows:
+			self.row_heights = group_max(row_indices, heights, len(self.row_heights), self.row_heights)
+		if cols:
+			self.col_widths.set_widths(group_max(col_indices, widths, len(self.col_widths), list(self.col_widths)))
+		self.relayoutColumns()
+		if self.visible:
+			# shrunk rows can make room for further rows
+			self.fillInChildren()
+
+	def fitToText(self, padding=(0,0), rows=True, cols=True):
+		"""
+		Sets the content_size of every non empty cell (off screen ones included) to the size of its text plus padding
+		and fits rows and columns to them, see autoSize. The texts are measured in one batch per font size, hence every
+		distinct text only once (see text_metrics.TextMetrics.measure_many).
+		"""
+		for row in self.visible + self.frozen_visible:
+			for cell in row.visible + row.frozen_visible:
+				cell.fitContentToText(padding)
+		self.updateDataFromVisible()
+
+		source = self.data.data if isinstance(self.data, DataView) else self.data
+		batches = {}
+		for row_index, raw_data in iter_filled(source):
+			cells = raw_data['init_data'].get('data')
+			if not cells:
+				continue
+			for col_index, cell in iter_filled(cells):
+				init_data = cell['init_data']
+				wrapped_init_data = CellWrapper.get_wrapped_init_data(init_data)
+				if not wrapped_init_data:
+					continue
+				batch = batches.setdefault(BaseText.get_data_font_size(wrapped_init_data), ([], []))
+				batch[0].append(init_data)
+				batch[1].append(wrapped_init_data.get('this_text', ''))
+
+		for font_size, (records, texts) in batches.items():
+			for init_data, (width, height) in zip(records, text_metrics.measure_many(texts, font_size)):
+				init_data['content_size'] = [width + padding[0], height + padding[1]]
+		self.autoSize(rows=rows, cols=cols)
+
+	def get_col_window(self, delta_x):
+		"""
+		Returns the columns [first_col, last_col] all rows should show after moving by delta_x, None if there is no
+		horizontal move. The window is derived once from the cells of the first row that has any, using the same
+		conditions as HorizontalLayout.inspect (see inspectSecond / inspectLast and inspectPenultimate / inspectFirst) but
+		evaluated on the shared col_widths instead of on the cells of every row.
+		"""
+		if not delta_x:
+			return None
+		reference_row = next((row for row in self.visible if row.visible), None)
+		if reference_row is None:
+			return None
+
+		col_widths = self.col_widths
+		first_col = reference_row.visible[0].data_index
+		last_col = reference_row.visible[-1].data_index
+		# x of column 0 after the move
+		x = reference_row.visible[0].real_pos[0] - col_widths.offset(first_col) + delta_x
+
+		anchor = self.get_anchor()
+		left = anchor.get_view_pos()[0]
+		right = left + anchor.real_size[0]
+
+		if delta_x > 0:
+			while first_col > reference_row.get_first_index() and x + col_widths.offset(first_col + 1) >= left:
+				first_col -= 1
+			while last_col > first_col and x + col_widths.offset(last_col) - col_widths[last_col] > right:
+				last_col -= 1
+		else:
+			while last_col + 1 < len(col_widths) and x + col_widths.offset(last_col) <= right:
+				last_col += 1
+			while first_col < last_col and x + col_widths.offset(first_col + 1) + col_widths[first_col] < left:
+				first_col += 1
+		return first_col, last_col
+
+	def propagate_inspect(self, delta_x, delta_y):
+		"""
+		Instead of letting every row run the horizontal inspect on its own, all rows get the same column window.
+		"""
+		col_window = self.get_col_window(delta_x)
+		for row in self.visible:
+			if self.is_fully_visible(row):
+				continue
+			if col_window is not None:
+				row.updateColWindow(*col_window)
+			row.propagate_inspect(delta_x, delta_y)
+		if col_window is not None:
+			for row in self.frozen_visible:
+				row.updateColWindow(*col_window)
+
+	def relayout(self, col_widths=None, row_heights=None, override_content_size=False):
+		"""
+		Batched relayout for new col_widths and / or row_heights. Starting at the top of the first visible row, the
+		positions of the rows follow from the cumulative row_heights. Every row and every visible cell gets updated once,
+		see RowLayout.relayout.
+		"""
+		if col_widths is not None and col_widths is not self.col_widths:
+			# published once for all rows
+			self.col_widths.set_widths(col_widths)
+		if row_heights is not None:
+			self.row_heights = deepcopy(row_heights)
+
+		if self.visible:
+			first_row = self.visible[0]
+			top = first_row.real_pos[1] + first_row.real_size[1]
+			for row in self.visible:
+				height = self.get_row_height(self.get_data_index(row.data_index))
+				top -= height
+				row.relayout(
+					height=height,
+					real_pos=[row.real_pos[0], top],
+					override_content_size=override_content_size
+				)
+
+		if self.frozen_visible:
+			anchor = self.get_anchor()
+			frame_top = anchor.get_view_pos()[1] + anchor.real_size[1]
+			for row in self.frozen_visible:
+				top = frame_top - sum(self.get_row_height(row_index) for row_index in range(row.data_index + 1))
+				row.relayout(
+					height=self.get_row_height(row.data_index),
+					real_pos=[row.real_pos[0], top],
+					override_content_size=override_content_size
+				)
+
+		if col_widths is not None:
+			self.calculate_max_child_width()
 
 
 
@@ -1,6 +1,14 @@
 from gui_framework.base_layouts import BaseLayout
-from gui_framework.advanced_layouts import GridLayout, RowLayout, CellWrapper
-from gui_framework.utils import Touch
+from gui_framework.advanced_layouts import GridLayout, RowLayout, CellWrapper, NestedVerticalLayout
+from gui_framework.utils import Touch, IntervalIndex
+from gui_framework import snapshot
+
+from kivy.clock import Clock
+
+from collections import OrderedDict
+from itertools import accumulate
+from bisect import bisect_right
+from array import array
 
 from time import time
 
@@ -28,13 +36,29 @@ class BaseDesign(BaseLayout):
 	double_tab_duration = 0.4
 	move_cursor_duration = 0.5
 	touch_margin = 20
+	move_touch: Touch = None
+	coalesce_moves = False
+	pending_dpos = (0,0)
+	move_event = None
+	frame_move_events = 0
+	move_frames = 0
+	move_events = 0
+	max_frame_move_events = 0
+	hit_index: IntervalIndex = None
+	pinch_zoom = False
+	pinch_touches = None
+	pinch_distance = 0
+	pending_scale = 1
+	pinch_focal_point = (0,0)
+	pinch_event = None
 
 	def on_touch_down(self, touch, *args):
+		if self.pinch_zoom and self.addPinchTouch(touch):
+			return
 		self.mode = None
-		for layout in self.layouts:
-			if layout.collideWidget(touch.x, touch.y):
-				self.touched_layout = layout
-				break
+		layout = self.get_layout_at(touch.x, touch.y)
+		if layout is not None:
+			self.touched_layout = layout
 		t = time()
 		if t - self.time_down < self.double_tab_duration:
 			self.is_double_tab = True
@@ -48,13 +72,22 @@ class BaseDesign(BaseLayout):
 			if self.touched_layout.onTouchDown(touch):
 				self.locked = True
 
+	def get_move_touch(self):
+		# one Touch is reused for all moves instead of allocating a new one per event
+		if self.move_touch is None:
+			self.move_touch = Touch()
+		return self.move_touch
+
 	def on_touch_move(self, touch, *args):
+		if self.mode == 'pinching':
+			self.movePinch(touch)
+			return
 		self.sum_dpos = (self.sum_dpos[0] + touch.dpos[0], self.sum_dpos[1] + touch.dpos[1])
 
 		if not self.is_moving:
 			tm = self.touch_margin
 			if self.sum_dpos[0] > tm or self.sum_dpos[0] < -tm or self.sum_dpos[1] > tm or self.sum_dpos[1] < -tm:
-				my_touch = Touch()
+				my_touch = self.get_move_touch()
 				my_touch.updatePos(touch.x, touch.y)
 				my_touch.updateDpos(self.sum_dpos)
 				touch = my_touch
@@ -64,9 +97,19 @@ class BaseDesign(BaseLayout):
 
 		if self.mode == 'moving':
 			if self.touched_layout:
-				self.touched_layout.move(touch)
+				if self.coalesce_moves:
+					self.coalesceMove(touch)
+				else:
+					self.touched_layout.move(touch)
 
 	def on_touch_up(self, touch, *args):
+		if self.pinch_touches:
+			self.pinch_touches.pop(touch.uid, None)
+		if self.mode == 'pinching':
+			# the remaining finger must not start moving the layout
+			if not self.pinch_touches:
+				self.endPinch()
+			return None
 		return_from_touch = None
 		if self.mode is None:
 			if self.touched_layout:
@@ -74,10 +117,178 @@ class BaseDesign(BaseLayout):
 				if return_from_touch:
 					self.locked = True
 		else:
-			self.touched_layout.clearTouch(touch)
+			self.flushMove()
+			if self.touched_layout:
+				self.touched_layout.clearTouch(touch)
 		self.touched_layout = None
 		return return_from_touch
 
+	def enableMoveCoalescing(self):
+		"""
+		Input devices with a high sample rate deliver several move events per frame. Instead of calling
+		touched_layout.move for each of them, the deltas get summed up and applied with a single move per frame.
+		"""
+		self.coalesce_moves = True
+
+	def disableMoveCoalescing(self):
+		self.flushMove()
+		self.coalesce_moves = False
+
+	def coalesceMove(self, touch):
+		self.pending_dpos = (self.pending_dpos[0] + touch.dpos[0], self.pending_dpos[1] + touch.dpos[1])
+		move_touch = self.get_move_touch()
+		move_touch.updatePos(touch.x, touch.y)
+		self.frame_move_events += 1
+		if self.move_event is None:
+			self.move_event = Clock.schedule_once(self.applyMove)
+
+	def applyMove(self, *args):
+		self.move_event = None
+		if not self.frame_move_events:
+			return
+		self.move_frames += 1
+		self.move_events += self.frame_move_events
+		self.max_frame_move_events = max(self.max_frame_move_events, self.frame_move_events)
+		self.frame_move_events = 0
+
+		move_touch = self.get_move_touch()
+		move_touch.updateDpos(self.pending_dpos)
+		self.pending_dpos = (0,0)
+		if self.touched_layout:
+			self.touched_layout.move(move_touch)
+
+	def flushMove(self):
+		"""
+		Applies a pending move right away, e.g. before the touch gets released.
+		"""
+		if self.move_event is not None:
+			self.move_event.cancel()
+		self.applyMove()
+
+	def enablePinchZoom(self):
+		"""
+		Two touches on a layout that supports zooming (see base_layouts.ZoomLayout.zoomAt) zoom it around the center
+		between them. The scale changes of all move events within a frame are applied with a single zoomAt.
+		"""
+		self.pinch_zoom = True
+		self.pinch_touches = {}
+
+	def disablePinchZoom(self):
+		self.endPinch()
+		self.pinch_zoom = False
+		self.pinch_touches = None
+
+	def addPinchTouch(self, touch):
+		"""
+		Registers touch and starts pinching with the second touch on a zoomable layout. Returns True if touch belongs to
+		the pinch and must not be handled as a regular touch.
+		"""
+		self.pinch_touches[touch.uid] = touch
+		if self.mode == 'pinching':
+			return True
+		if len(self.pinch_touches) != 2:
+			return False
+		if self.touched_layout is None or not hasattr(self.touched_layout, 'zoomAt'):
+			return False
+		self.flushMove()
+		self.mode = 'pinching'
+		self.is_moving = False
+		self.pinch_distance = self.get_pinch_distance()
+		self.pending_scale = 1
+		return True
+
+	def get_pinch_distance(self):
+		first, second = list(self.pinch_touches.values())[:2]
+		return ((first.x - second.x) ** 2 + (first.y - second.y) ** 2) ** 0.5
+
+	def get_pinch_center(self):
+		first, second = list(self.pinch_touches.values())[:2]
+		return ((first.x + second.x) / 2, (first.y + second.y) / 2)
+
+	def movePinch(self, touch):
+		if touch.uid not in self.pinch_touches or len(self.pinch_touches) < 2:
+			return
+		distance = self.get_pinch_distance()
+		if not self.pinch_distance or not distance:
+			return
+		self.pending_scale *= distance / self.pinch_distance
+		self.pinch_distance = distance
+		self.pinch_focal_point = self.get_pinch_center()
+		if self.pinch_event is None:
+			self.pinch_event = Clock.schedule_once(self.applyPinch)
+
+	def applyPinch(self, *args):
+		self.pinch_event = None
+		scale = self.pending_scale
+		self.pending_scale = 1
+		if scale != 1 and self.touched_layout is not None:
+			self.touched_layout.zoomAt(scale, self.pinch_focal_point)
+
+	def endPinch(self):
+		if self.pinch_event is not None:
+			self.pinch_event.cancel()
+			self.applyPinch()
+		if self.mode == 'pinching':
+			self.mode = None
+			self.touched_layout = None
+		self.pinch_distance = 0
+
+	def moveStats(self) -> dict:
+		return {
+			'frames': self.move_frames,
+			'events': self.move_events,
+			'events_per_frame': self.move_events / self.move_frames if self.move_frames else 0,
+			'max_events_per_frame': self.max_frame_move_events
+		}
+
+	def updateHitIndex(self):
+		"""
+		NOTE: The index gets built lazily when the number of layouts changes. After moving or resizing layouts, call
+		this method manually.
+		"""
+		intervals = []
+		for layout_index, layout in enumerate(self.layouts):
+			intervals.append((layout.real_pos[0], layout.real_pos[0] + layout.real_size[0], layout_index))
+		self.hit_index = IntervalIndex(intervals)
+
+	def get_layout_at(self, x, y):
+		"""
+		Returns the first layout (in the order of self.layouts) at x, y or None.
+		"""
+		if self.hit_index is None or len(self.hit_index) != len(self.layouts):
+			self.updateHitIndex()
+		for layout_index in sorted(self.hit_index.query(x)):
+			layout = self.layouts[layout_index]
+			if layout.collideWidget(x, y):
+				return layout
+		return None
+
+	def hit_test(self, x, y) -> list:
+		"""
+		Returns the path from the touched layout down to the deepest (nested) child at x, y, e.g. [grid, row, cell
+		wrapper, cell]. The design itself is not part of the path.
+		"""
+		layout = self.get_layout_at(x, y)
+		if layout is None:
+			return []
+		return layout.hit_test(x, y)
+
+	def saveSnapshot(self, file_path, registry: snapshot.ChildTypeRegistry):
+		"""
+		Writes the state of all layouts to file_path, see snapshot for the format.
+		"""
+		with open(file_path, 'wb') as snapshot_file:
+			snapshot_file.write(snapshot.dumps_design(self, registry))
+
+	def loadSnapshot(self, file_path, registry: snapshot.ChildTypeRegistry):
+		"""
+		NOTE: The layouts need to exist already (in the same order as when saving), only their state gets restored.
+		"""
+		with open(file_path, 'rb') as snapshot_file:
+			layout_states = snapshot.loads_design(snapshot_file.read(), registry)
+		for layout, (data, window, state) in zip(self.layouts, layout_states):
+			layout.restoreState(data, window, state)
+
 	def addLayout(self, layout_index):
 		"""
 		so bissl wie addWidget
@@ -98,76 +309,301 @@ class LogsDesign(BaseDesign):
 class Page(CellWrapper):
 	pass
 
+class ItemsPage(NestedVerticalLayout):
+	"""
+	A page showing a range of items from top to bottom, see FutureImplementation.
+
+	NOTE: Like for all nested layouts, the items need to be nested layouts themselves (e.g. wrapped in a CellWrapper).
+	"""
+	pass
+
 class PageLayout(RowLayout):
 	pass
 
 class PagesDesign(BaseDesign, GridLayout):
+	"""
+	The pages are stored like the cells of a grid: data holds one record per row of pages with the records of its pages
+	in 'init_data' 'data', page_index is [row_index, col_index].
+
+	Only the current page is shown. It and its neighbours (see get_neighbour_indices) are kept instantiated in an LRU
+	cache of max_pages pages, the neighbours get preloaded the frame after switching. Hence a swipe shows a page that is
+	ready already. Evicted pages are written back to data via to_data.
+	"""
 	current_page = None
+	page_index = None
+	max_pages = 9
+	pages: OrderedDict = None
+	preload_event = None
+	swipe_distance = 100
+	def __init__(self, *args, max_pages=9, **kwargs):
+		super(PagesDesign, self).__init__(*args, **kwargs)
+		self.max_pages = max_pages
+		self.pages = OrderedDict()
+
+	def on_touch_up(self, touch, *args):
+		if self.mode == 'moving' and max(abs(self.sum_dpos[0]), abs(self.sum_dpos[1])) > self.swipe_distance:
+			self.switch_page()
+		return super(PagesDesign, self).on_touch_up(touch, *args)
+
 	def switch_page(self):
 		"""
 		There will be a certain threshold of sum_dpos beyond which switch_page will be called. This condition is not
 		implemented within switch_page itself, but the move / on_touch_move method.
 		"""
-		grid_index = self.current_page.get_data_index()
-		direction = 1
+		if self.page_index is None:
+			return
+		row_index, col_index = self.page_index
 		if abs(self.sum_dpos[0]) > abs(self.sum_dpos[1]):
-			direction = 0
-		new_index = grid_index[direction]
-		if self.sum_dpos[direction] > 0:
-			"""
-			in case of y movment (direction=1) we want to move the index by -1
-			in case of x movment (direction=0) we want to move the index by +1
-			"""
-			new_index -= 2 * direction - 1
+			# x movement moves the column index by +1 for sum_dpos > 0, by -1 otherwise
+			col_index += 1 if self.sum_dpos[0] > 0 else -1
 		else:
-			"""
-			in case of y movment (direction=1) we want to move the index by +1
-			in case of x movment (direction=0) we want to move the index by -1
-			"""
-			new_index += 2 * direction - 1
-		if new_index < 0:
-			return
-		elif new_index >= self.grid_size[direction]:
+			# y movement moves the row index by -1 for sum_dpos > 0, by +1 otherwise
+			row_index += -1 if self.sum_dpos[1] > 0 else 1
+		if not self.is_page_index(row_index, col_index):
 			return
+		self.switch_to_page([row_index, col_index])
+
+	def get_pages(self, row_index) -> list:
+		return self.data[row_index]['init_data']['data']
+
+	def is_page_index(self, row_index, col_index):
+		if not 0 <= row_index < len(self.data) or col_index < 0:
+			return False
+		raw_data = self.data[row_index]
+		if not raw_data:
+			return False
+		return col_index < len(raw_data['init_data']['data'])
 
-		grid_index[direction] = new_index
-		self.swith_to_page(grid_index)
+	def get_neighbour_indices(self, page_index) -> list:
+		"""
+		Returns the indices of the pages above, below, left and right of page_index that exist.
+		"""
+		row_index, col_index = page_index
+		neighbours = [[row_index - 1, col_index], [row_index + 1, col_index], [row_index, col_index - 1], [row_index, col_index + 1]]
+		return [neighbour for neighbour in neighbours if self.is_page_index(*neighbour)]
+
+	def obtainPage(self, page_index):
+		"""
+		Returns the cached page at page_index, otherwise instantiates it (filling the frame of the design).
+		"""
+		key = tuple(page_index)
+		page = self.pages.get(key)
+		if page is not None:
+			self.pages.move_to_end(key)
+			return page
+		raw_data = self.get_pages(page_index[0])[page_index[1]]
+		init_data = dict(raw_data['init_data'])
+		init_data['real_pos'] = list(self.real_pos)
+		init_data['real_size'] = list(self.real_size)
+		page = raw_data['child_type'](page_index[1], **init_data)
+		page.fillInFromScratch()
+		self.pages[key] = page
+		return page
 
 	def switch_to_page(self, page_index):
-		page_data = self.data[page_index[0]]['init_data'][page_index[1]]
-		# TODO
-		# instatiate / load page
-		# transition page
-		# remove current_page
-		# set current_page with new page
+		page = self.obtainPage(page_index)
+		if self.current_page is not None and self.current_page is not page:
+			self.remove_widget(self.current_page)
+		if page.parent is None:
+			self.add_widget(page)
+		self.current_page = page
+		self.page_index = list(page_index)
+		if self.preload_event is None:
+			self.preload_event = Clock.schedule_once(self.preloadNeighbours)
+
+	def preloadNeighbours(self, *args):
+		self.preload_event = None
+		if self.page_index is None:
+			return
+		for neighbour in self.get_neighbour_indices(self.page_index):
+			self.obtainPage(neighbour)
+		# the current page is the most recently used one
+		self.pages.move_to_end(tuple(self.page_index))
+		self.evictPages()
 
+	def evictPages(self):
+		"""
+		Evicts the least recently used pages beyond max_pages, except for the current page and its neighbours.
+		"""
+		keep = {tuple(neighbour) for neighbour in self.get_neighbour_indices(self.page_index)}
+		keep.add(tuple(self.page_index))
+		for key in list(self.pages):
+			if len(self.pages) <= self.max_pages:
+				break
+			if key not in keep:
+				self.evictPage(key)
+
+	def evictPage(self, key):
+		page = self.pages.pop(key)
+		self.get_pages(key[0])[key[1]] = page.to_data()
 
 
 class FutureImplementation(PagesDesign):
-	def initialise(self):
+	"""
+	Paginates a flat list of items into pages of the size of the design. The pages are filled (1,1) to (m,1) first,
+	then (1,2) to (m,2) and so on, m being page_rows.
+
+	Pagination is a pure geometry pass: the prefix sums of the items extents (real_size along the page orientation)
+	are kept in item_offsets, the end of each page gets bisected from them. Hence no widget gets instantiated for
+	measuring. Appending items only re-splits from the start of the last page, see appendItems.
+
+	NOTE: Items larger than a page get a page of their own.
+
+	NOTE: Edits of a page get written back into items when the page is evicted (see evictPage) or re-split (see
+	appendItems). The pages keep their items, edits do not repaginate.
+	"""
+	page_type = ItemsPage
+	page_rows = 1
+	page_orientation = 'vertical'
+	items: list = None
+	item_offsets: array = None
+	page_starts: list = None
+	def initialise(self, items=None, page_rows=1, page_type=None, page_orientation='vertical'):
+		self.page_rows = page_rows
+		if page_type is not None:
+			self.page_type = page_type
+		self.page_orientation = page_orientation
+		self.items = []
+		self.item_offsets = array('d', [0])
+		self.page_starts = []
+		self.data = []
+		self.pages = OrderedDict()
+		self.appendItems(items)
+
+	def get_axis(self):
+		return 1 if self.page_orientation == 'vertical' else 0
+
+	def get_item_extent(self, raw_data):
+		real_size = raw_data.get('init_data', {}).get('real_size')
+		if real_size is None:
+			return 0
+		return real_size[self.get_axis()]
+
+	def appendItems(self, items):
+		"""
+		Appends items and paginates them. The pages before the last one stay untouched, the last one might get filled
+		up further.
+		"""
+		if self.items is None:
+			self.initialise()
+		if not items:
+			return
+		if self.page_starts:
+			# the last page gets re-split from items, which need to hold its edits
+			self.storePage(self.get_page_index(len(self.page_starts) - 1))
+		self.items.extend(items)
+		offsets = accumulate((self.get_item_extent(raw_data) for raw_data in items), initial=self.item_offsets[-1])
+		next(offsets)
+		self.item_offsets.extend(offsets)
+
+		first_page = max(len(self.page_starts) - 1, 0)
+		start_index = self.page_starts.pop() if self.page_starts else 0
+		self.page_starts.extend(self.splitUpData(start_index))
+		self.updatePages(first_page)
+
+	def splitUpData(self, start_index=0) -> list:
+		"""
+		Returns the first item index of every page, starting with a page at start_index. A page takes all items whose
+		extents sum up to at most the size of the design.
+		"""
+		frame_extent = self.real_size[self.get_axis()]
+		offsets = self.item_offsets
+		item_count = len(self.items)
+		page_starts = []
+		while start_index < item_count:
+			page_starts.append(start_index)
+			# offsets[end_index] - offsets[start_index] is the extent of the items start_index to end_index - 1
+			end_index = bisect_right(offsets, offsets[start_index] + frame_extent, start_index + 1) - 1
+			start_index = max(end_index, start_index + 1)
+		return page_starts
+
+	def get_page_count(self):
+		return len(self.page_starts)
+
+	def get_page_range(self, page_number) -> tuple:
+		"""
+		Returns (start_index, end_index) of the items on page page_number (counting in filling order).
 		"""
-		pseudo code:
+		start_index = self.page_starts[page_number]
+		if page_number + 1 < len(self.page_starts):
+			return start_index, self.page_starts[page_number + 1]
+		return start_index, len(self.items)
 
-		while not "all data has a widget assigned to it":
-			new layout
-			while layout.real_size < design.frame_size:
-				layout.fillInChildren
+	def get_page_index(self, page_number) -> list:
+		return [page_number % self.page_rows, page_number // self.page_rows]
 
-		Strategie:
-			fill in vertical / horizontal, entsprechend pages vertical / horizontal erzeugen
-			alle überschießenden data in next_data speichern
-			dann horizontal / vertical weitergehen
+	def get_page_index_of_item(self, item_index) -> list:
+		return self.get_page_index(bisect_right(self.page_starts, item_index) - 1)
 
-		Also zur visuellen Erläuterung wenn man sich die pages wie ein (m,n) grid vorstellt, dann wird das grid zunächst
-		(1,1) bis (m,1) befüllt, dann gehts mit (1,2) weiter bis dann (m,n) erreicht ist.
+	def get_page_number(self, page_index) -> int:
+		return page_index[1] * self.page_rows + page_index[0]
 
-		~> ist die frage wie man das machen kann
-		~> fillÍnChildren, reviewChildren mit if not fully fit to frame, dann sowas wie splitUpData
+	def evictPage(self, key):
+		super(FutureImplementation, self).evictPage(key)
+		self.updateItemsFromPage(key)
+
+	def storePage(self, page_index):
 		"""
-		pass
+		Writes the instantiated page at page_index (if cached) back into data and items, the page stays cached.
+		"""
+		page = self.pages.get(tuple(page_index))
+		if page is None:
+			return
+		self.get_pages(page_index[0])[page_index[1]] = page.to_data()
+		self.updateItemsFromPage(page_index)
 
-	def splitUpData(self):
-		pass
+	def updateItemsFromPage(self, page_index):
+		"""
+		Replaces the items of the page at page_index by the ones of its page record. If the number of items changed,
+		the following pages get shifted accordingly.
+		"""
+		page_number = self.get_page_number(page_index)
+		start_index, end_index = self.get_page_range(page_number)
+		page_items = list(self.get_pages(page_index[0])[page_index[1]]['init_data']['data'])
+		extents = [self.get_item_extent(raw_data) for raw_data in page_items]
+		old_extents = [self.get_item_extent(raw_data) for raw_data in self.items[start_index:end_index]]
+		self.items[start_index:end_index] = page_items
+
+		if extents != old_extents:
+			del self.item_offsets[start_index + 1:]
+			offsets = accumulate(
+				(self.get_item_extent(raw_data) for raw_data in self.items[start_index:]), initial=self.item_offsets[-1]
+			)
+			next(offsets)
+			self.item_offsets.extend(offsets)
+
+		delta = len(page_items) - (end_index - start_index)
+		if delta:
+			for number in range(page_number + 1, len(self.page_starts)):
+				self.page_starts[number] += delta
+
+	def updatePages(self, first_page=0):
+		"""
+		Writes the page records from first_page on into data. Instantiated pages among them get dropped from the cache,
+		the current one gets rebuilt right away.
+		"""
+		page_width, page_height = self.real_size
+		for page_number in range(first_page, len(self.page_starts)):
+			row_index, col_index = self.get_page_index(page_number)
+			while len(self.data) <= row_index:
+				self.data.append({'child_type': PageLayout, 'init_data': {'real_size': [0, page_height], 'data': []}})
+			start_index, end_index = self.get_page_range(page_number)
+			page_data = {
+				'child_type': self.page_type,
+				'init_data': {'real_size': [page_width, page_height], 'data': self.items[start_index:end_index]}
+			}
+			row_init_data = self.data[row_index]['init_data']
+			if col_index < len(row_init_data['data']):
+				row_init_data['data'][col_index] = page_data
+			else:
+				row_init_data['data'].append(page_data)
+				row_init_data['real_size'][0] = page_width * len(row_init_data['data'])
+
+			page = self.pages.pop((row_index, col_index), None)
+			if page is not None and page is self.current_page:
+				self.remove_widget(page)
+				self.current_page = None
+				self.switch_to_page([row_index, col_index])
 
 	def reviewPage(self, layout):
 		def reviewLayout(layout, widgets):
@@ -6,9 +6,18 @@ from kivy.uix.button import Button
 from kivy.uix.floatlayout import FloatLayout
 from kivy.uix.textinput import TextInput
 from kivy.properties import ListProperty, ObjectProperty, NumericProperty, BooleanProperty, StringProperty
-
-from gui_framework.utils import Touch, RealWidget
-
+from kivy.graphics import PushMatrix, PopMatrix, Translate
+from kivy.clock import Clock
+
+from gui_framework.utils import Touch, RealWidget, OffsetIndex, RecyclePool, KeyView
+from gui_framework.data_containers import RecordStore, RecordRef, PagedData, DataView, is_data_provider
+from gui_framework import snapshot
+from gui_framework.text_metrics import text_metrics
+
+from time import perf_counter
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from math import hypot
 import inspect
 
 
@@ -18,6 +27,7 @@ advanced_layouts.
 """
 
 DEFAULT_SIZE = 10
+DEFAULT_FONT_SIZE = 11
 
 class BaseAttributes(object):
 	padding: tuple = (0,0,0,0)
@@ -31,6 +41,19 @@ class BaseWidget(Widget, BaseAttributes):
 	real_pos: ListProperty = ListProperty((0,0))
 	real_size: ListProperty = ListProperty((DEFAULT_SIZE,DEFAULT_SIZE))
 	is_bottom_widget = False
+	is_dirty = False
+	dirty_properties: list = ['real_size']
+	def bindDirtyProperties(self):
+		"""
+		A widget is dirty if any of the properties that end up in to_data changed since its data was last written, see
+		BaseLayout.updateDataFromVisible. real_pos is not one of them, it changes on every move.
+		"""
+		for name in self.dirty_properties:
+			self.fbind(name, self.markDirty)
+
+	def markDirty(self, *args):
+		self.is_dirty = True
+
 	def updatePos(self, delta):
 		self.real_pos = [self.real_pos[0] + delta[0], self.real_pos[1] + delta[1]]
 		if not self.is_bottom_widget:
@@ -153,6 +176,41 @@ object class and put a ChildWidget class on top of it, taking its original place
 value in 'init_data'.
 
 0.11.0 moved fillInFromScratch to base layouts
+
+0.12.0 Optional offset index (prefix sums over the extents in data) for O(log n) offset <-> data_index lookups, see
+BaseLayout.enableOffsetIndex.
+
+0.13.0 Optional recycling of removed children per child_type, see MoveLayout.enableRecycling.
+
+0.14.0 data can also be one of the containers in data_containers (e.g. ColumnarData), as long as it presents the same
+indexing interface as a list. Geometry reads go through BaseLayout.get_data_real_size.
+
+0.15.0 Optional normalized storage of leaf records for nested layouts, see BaseLayout.normalizeData.
+
+0.16.0 data can be paged on demand from a data provider, see BaseLayout.setDataProvider.
+
+0.17.0 Dirty tracking: updateDataFromVisible and removeWidget only write children whose dirty_properties changed.
+
+0.18.0 Binary snapshots of data and the visible window, see BaseLayout.saveSnapshot and snapshot.
+
+0.19.0 Optional group translation for MoveLayout.move, see MoveLayout.enableGroupTranslation. All conditions and deltas
+refer to the frame via MoveLayout.get_view_pos instead of real_pos.
+
+0.20.0 Optional frame budget for filling in children, see MoveLayout.enableIncrementalFill.
+
+0.21.0 BaseDesign can coalesce touch moves to one move per frame, see BaseDesign.enableMoveCoalescing.
+
+0.22.0 Hit testing, see BaseDesign.hit_test and MoveLayout.get_child_at.
+
+0.23.0 Sorted / filtered views on data, see MoveLayout.sortData and data_containers.DataView.
+
+0.24.0 Cached text measurements, see text_metrics. FontLayout.resizeWidgetsToFont does not create a helper widget
+anymore.
+
+0.25.0 Pinch zoom around a focal point, see ZoomLayout.zoomAt and BaseDesign.enablePinchZoom. ZoomLayout.resizeWidgets
+stacks the children by their own heights instead of assuming equal heights.
+
+0.26.0 Level of detail: cheap placeholder children while moving / zooming fast, see MoveLayout.enableLOD.
 """
 
 """
@@ -197,6 +255,33 @@ class ChildWidget(TouchWidget, BaseChild):
 		TouchWidget.__init__(self, **kwargs)
 		BaseChild.__init__(self, data_index)
 		self.is_bottom_widget = True
+		self.bound_keys = list(kwargs)
+		self.bindDirtyProperties()
+
+	def reset(self):
+		"""
+		Gets called when a recycled child is about to be rebound to new data. Implement this method if your child holds
+		state beyond its init_data (animations, touch state, ...) or derives state from init_data in __init__, since
+		__init__ does not run again.
+		"""
+		pass
+
+	def rebind(self, data_index, **init_data):
+		"""
+		Counterpart to __init__ for recycled children, see MoveLayout.enableRecycling. Properties that the previous
+		init_data set but init_data does not get reset to their defaults first, hence the child looks like a new one.
+		"""
+		self.reset()
+		self.updateIndex(data_index)
+		for key in self.bound_keys:
+			if key not in init_data:
+				prop = self.property(key, quiet=True)
+				if prop is not None:
+					setattr(self, key, prop.defaultvalue)
+		for key, value in init_data.items():
+			setattr(self, key, value)
+		self.bound_keys = list(init_data)
+		self.is_dirty = False
 
 """
 BaseLayout should not even be inherited from directly
@@ -211,8 +296,13 @@ class BaseLayout(TouchWidget):
 	visible: list = []
 	mode: str = ''
 	disable_touch: bool = False
+	offset_index: OffsetIndex = None
+	data_store: RecordStore = None
+	snapshot_attributes: list = []
 	def __init__(self, data=[], **kwargs):
 		super(BaseLayout, self).__init__(**kwargs)
+		if is_data_provider(data):
+			data = PagedData(data)
 		self.data = data
 
 		# setting visible to empty list is apparently necessary; otherwise it gets treated as a class variable and is
@@ -222,17 +312,104 @@ class BaseLayout(TouchWidget):
 	def updateDataFromChild(self, child_widget):
 		data_index = child_widget.data_index
 		raw_data = child_widget.to_data()
-		self.data[data_index] = raw_data
+		current_data = self.data[data_index]
+		if isinstance(current_data, RecordRef):
+			# normalized leaf record, the parents only hold references to it
+			current_data.set(raw_data)
+		else:
+			self.data[data_index] = raw_data
+		child_widget.is_dirty = False
+
+		# the data of this layout changed, hence its parent needs to write it as well
+		self.is_dirty = True
+		if self.offset_index is not None:
+			self.offset_index.update(data_index, self.get_data_extent(raw_data))
 
 	def formatData(self, init_data, child_type):
 		raw_data = {'child_type': child_type, 'init_data': init_data}
 		return raw_data
 
 	def addData(self, data_index, data):
-		self.data.insert(self.get_data_index(data_index), data)
+		data_index = self.get_data_index(data_index)
+		if self.data_store is not None:
+			data = self.data_store.store(data)
+		self.data.insert(data_index, data)
+		if self.offset_index is not None:
+			self.offset_index.insert(data_index, self.get_data_extent(data))
 
 	def removeData(self, data_index):
-		self.data.pop(self.get_data_index(data_index))
+		data_index = self.get_data_index(data_index)
+		data = self.data.pop(data_index)
+		if self.data_store is not None:
+			self.data_store.discard(data)
+		if self.offset_index is not None:
+			self.offset_index.pop(data_index)
+
+	def normalizeData(self, data_store=None):
+		"""
+		Moves all leaf records of data (recursively) into data_store and replaces them by references. A new RecordStore
+		gets created if none is given. See data_containers.RecordStore for more details.
+		"""
+		if data_store is None:
+			data_store = RecordStore()
+		data_store.normalize(self.data)
+		self.data_store = data_store
+		return data_store
+
+	def setDataProvider(self, provider, chunk_size=256, max_chunks=16):
+		"""
+		Lets the layout page its data on demand from provider (see data_containers.DataProvider) instead of holding all
+		of it in memory. Only max_chunks chunks of chunk_size elements are resident at any time.
+
+		NOTE: enableOffsetIndex reads every element of data, hence it loads all chunks once.
+		"""
+		self.data = PagedData(provider, chunk_size=chunk_size, max_chunks=max_chunks)
+		self.offset_index = None
+
+	def get_data_real_size(self, data_index):
+		"""
+		Containers like data_containers.ColumnarData provide a fast path for geometry reads, otherwise we need to go
+		through 'init_data'.
+		"""
+		get_real_size = getattr(self.data, 'get_real_size', None)
+		if get_real_size is not None:
+			return get_real_size(data_index)
+		return self.data[data_index]['init_data']['real_size']
+
+	def get_data_extent(self, raw_data):
+		"""
+		The extent of an element of data along the direction the layout aligns its children in. Layouts without such a
+		direction have no extents.
+		"""
+		return 0
+
+	def enableOffsetIndex(self):
+		"""
+		Builds the prefix sums over the extents of data, which are then kept up to date by addData, removeData and
+		updateDataFromChild.
+
+		NOTE: When assigning a new list to data, this method needs to be called again.
+		"""
+		self.offset_index = OffsetIndex([self.get_data_extent(raw_data) for raw_data in self.data])
+
+	def disableOffsetIndex(self):
+		self.offset_index = None
+
+	def get_data_offset(self, data_index):
+		"""
+		Returns the distance from the start of the first element of data to the start of the element at data_index.
+		"""
+		if self.offset_index is None:
+			self.enableOffsetIndex()
+		return self.offset_index.offset(self.get_data_index(data_index))
+
+	def get_data_index_at(self, offset):
+		"""
+		Returns the data_index of the element covering offset (measured like in get_data_offset).
+		"""
+		if self.offset_index is None:
+			self.enableOffsetIndex()
+		return self.offset_index.find(offset)
 
 	def get_data_index(self, data_index):
 		# TODO: what was the idea behind d_index? kept it as comment if i might need it
@@ -249,6 +426,13 @@ class BaseLayout(TouchWidget):
 			data_index = len(self.data)
 		return data_index
 
+	def get_first_index(self):
+		"""
+		The data_index of the first child that can become visible. Records before it are not filled in as (scrolling)
+		children, see GridLayout.frozen_rows and RowLayout.frozen_cols.
+		"""
+		return 0
+
 	def get_visible_index(self, data_index):
 		if not self.visible:
 			return 0
@@ -264,9 +448,44 @@ class BaseLayout(TouchWidget):
 			visible_index = data_index - first_index
 		return visible_index
 
+	def isChildDirty(self, child_widget):
+		"""
+		Children without dirty tracking (not inheriting from BaseWidget) are always written.
+		"""
+		return getattr(child_widget, 'is_dirty', True)
+
 	def updateDataFromVisible(self):
+		"""
+		Only dirty children get written to data. Returns whether any child was written.
+		"""
+		changed = False
 		for child in self.visible:
-			self.updateDataFromChild(child)
+			if self.isChildDirty(child):
+				self.updateDataFromChild(child)
+				changed = True
+		return changed
+
+	def saveSnapshot(self, file_path, registry: snapshot.ChildTypeRegistry):
+		"""
+		Writes data and the visible window of this layout to file_path, see snapshot for the format. All child types in
+		data need to be registered in registry.
+		"""
+		with open(file_path, 'wb') as snapshot_file:
+			snapshot_file.write(snapshot.dumps(self, registry))
+
+	def loadSnapshot(self, file_path, registry: snapshot.ChildTypeRegistry):
+		with open(file_path, 'rb') as snapshot_file:
+			data, window, state = snapshot.loads(snapshot_file.read(), registry)
+		self.restoreState(data, window, state)
+
+	def restoreState(self, data, window, state):
+		for name, value in state.items():
+			setattr(self, name, value)
+		self.data = data
+		if self.data_store is not None:
+			self.normalizeData(self.data_store)
+		if self.offset_index is not None:
+			self.enableOffsetIndex()
 
 	def to_data(self):
 		"""
@@ -277,6 +496,15 @@ class BaseLayout(TouchWidget):
 		raw_data['init_data']['data'] = self.data
 		return raw_data
 
+	def hit_test(self, x, y) -> list:
+		"""
+		Returns the path from this layout down to the deepest (nested) child at x, y. The path is empty if x, y is not
+		within the layout.
+		"""
+		if not self.collideWidget(x, y):
+			return []
+		return [self]
+
 
 ## MOVE
 
@@ -293,12 +521,62 @@ class MoveLayout(BaseLayout):
 	max_child_width = DEFAULT_SIZE
 	max_child_height = DEFAULT_SIZE
 	orientation = 'vertical'
+	recycle_pool: RecyclePool = None
+	pending_windows: dict = {}
+	group_translation = False
+	scroll_offset = (0,0)
+	translate_instruction: Translate = None
+	incremental_fill = False
+	fill_budget = 0.004
+	fill_deadline = 0
+	fill_event = None
+	is_filling = False
+	lod_speed = None
+	lod_zoom_rate = 1
+	lod_settle_delay = 0.15
+	lod_event = None
+	is_fast = False
+	last_motion_time = 0
+	placeholders: set = set()
+	placeholder_keys: list = ['real_pos', 'real_size']
 	def create_child(self, child_type, data_index, init_data):
 		"""
 		There is customization needed for nested layouts, hence we encapsuled this one liner in a method.
 		"""
 		return child_type(data_index, **init_data)
 
+	def enableRecycling(self, max_size=32, recycle_pool=None):
+		"""
+		Removed children get stored in recycle_pool and rebound to new data on addWidget instead of being instantiated
+		again. Pass the same RecyclePool to several layouts to share it.
+
+		NOTE: Only ChildWidgets get recycled, nested layouts are always instantiated since they would need to be filled
+		in again anyway.
+
+		NOTE: A recycled child does not run __init__ again, see ChildWidget.rebind and ChildWidget.reset.
+		"""
+		if recycle_pool is None:
+			recycle_pool = RecyclePool(max_size)
+		self.recycle_pool = recycle_pool
+
+	def disableRecycling(self):
+		self.recycle_pool = None
+
+	def obtainChild(self, child_type, data_index, init_data):
+		"""
+		Returns a recycled child of child_type rebound to init_data if there is one, otherwise a new one.
+		"""
+		if self.recycle_pool is not None and issubclass(child_type, ChildWidget):
+			child = self.recycle_pool.pop(child_type)
+			if child is not None:
+				child.rebind(data_index, **init_data)
+				return child
+		return self.create_child(child_type, data_index, init_data)
+
+	def recycleChild(self, child_widget):
+		if self.recycle_pool is not None and isinstance(child_widget, ChildWidget):
+			self.recycle_pool.push(child_widget)
+
 	def additionalKwargsInsert(self, data_index):
 		"""
 		For layouts that inherit from this class, one will probably want to implement it with some 'real_pos' logic.
@@ -311,6 +589,11 @@ class MoveLayout(BaseLayout):
 		"""
 		NOTE: reposition of children has to be done "manually" by calling the corresponding method after insertWidget
 		"""
+		if self.needsFillBudget():
+			# called directly, the insert (and the fill of a nested child) gets a fill budget of its own
+			self.runBudgetedFill(self.insertWidget, data_index)
+			return
+
 		# calculate real_pos for inserted widget
 		additional_data = self.additionalKwargsInsert(data_index)
 
@@ -334,13 +617,90 @@ class MoveLayout(BaseLayout):
 		# add real_pos to raw_data
 		init_data.update(additional_data)
 
-		# create instance of added widget
-		new_child = self.create_child(child_type, data_index, init_data)
+		# create instance of added widget (or reuse a recycled one)
+		placeholder_type = self.get_placeholder_type(raw_data)
+		if placeholder_type is None:
+			new_child = self.obtainChild(child_type, data_index, init_data)
+		else:
+			placeholder_data = {key: init_data[key] for key in self.placeholder_keys if key in init_data}
+			new_child = self.obtainChild(placeholder_type, data_index, placeholder_data)
+			self.placeholders.add(new_child)
 
 		# add widget
 		self.visible.insert(visible_index, new_child)
 		self.add_widget(new_child, index=visible_index)
 
+	def restoreState(self, data, window, state):
+		"""
+		Replaces the visible children with the ones of the (snapshotted) window. Nested children get restored from
+		their windows as well instead of being filled in from scratch, see restoreWindow.
+		"""
+		for child in self.visible.copy():
+			self.deleteWidget(child)
+		super(MoveLayout, self).restoreState(data, window, state)
+		self.restoreWindow(window)
+
+	def restoreWindow(self, window):
+		"""
+		window is a list of (data_index, real_pos, window of the child or None), see snapshot.get_window.
+		"""
+		self.pending_windows = {}
+		for data_index, real_pos, child_window in window:
+			if child_window is not None:
+				self.pending_windows[data_index] = child_window
+			additional_data = self.additionalKwargsInsert(data_index)
+			additional_data['real_pos'] = real_pos
+			self.addWidget(data_index, additional_data)
+		self.pending_windows = {}
+
+	def get_data_view(self) -> DataView:
+		"""
+		Wraps data into a DataView (once). Afterwards, the data indices of the children refer to positions within the
+		view.
+		"""
+		if not isinstance(self.data, DataView):
+			self.data = DataView(self.data)
+		return self.data
+
+	def sortData(self, field=None, key=None, reverse=False):
+		"""
+		Sorts the elements by the value of field in 'init_data' (or by key(raw_data)) without touching data itself, see
+		data_containers.DataView. Only the visible children get replaced.
+		"""
+		self.updateDataFromVisible()
+		self.get_data_view().sort(field=field, key=key, reverse=reverse)
+		self.refillView()
+
+	def filterData(self, predicate=None, field=None):
+		"""
+		Shows only the elements for which predicate returns True, see DataView.filter. Without predicate, all elements
+		are shown again.
+		"""
+		self.updateDataFromVisible()
+		self.get_data_view().filter(predicate=predicate, field=field)
+		self.refillView()
+
+	def clearDataView(self):
+		"""
+		Goes back to data in its original order.
+		"""
+		if not isinstance(self.data, DataView):
+			return
+		self.updateDataFromVisible()
+		self.data = self.data.data
+		self.refillView()
+
+	def refillView(self):
+		"""
+		Replaces the visible children after the order of data changed. Their data is written already, hence they can be
+		deleted (and recycled) right away. Filling starts from the beginning of data again.
+		"""
+		for child in self.visible.copy():
+			self.deleteWidget(child)
+		if self.offset_index is not None:
+			self.enableOffsetIndex()
+		self.fillInFromScratch()
+
 	def calculate_max_child_width(self):
 		"""
 		This method follows the idea that a layout is at a fixed position with a fixed size on the screen and that its
@@ -366,12 +726,23 @@ class MoveLayout(BaseLayout):
 		self.max_child_height = max_child_height
 
 	def removeWidget(self, child_widget):
-		self.updateDataFromChild(child_widget)
+		if self.isChildDirty(child_widget):
+			self.updateDataFromChild(child_widget)
 		self.deleteWidget(child_widget)
 
 	def deleteWidget(self, child_widget):
 		self.visible.remove(child_widget)
 		self.remove_widget(child_widget)
+		self.placeholders.discard(child_widget)
+		self.recycleChild(child_widget)
+
+	def isChildDirty(self, child_widget):
+		"""
+		Placeholders (see enableLOD) never write to data, their record is the one of the full child.
+		"""
+		if child_widget in self.placeholders:
+			return False
+		return super(MoveLayout, self).isChildDirty(child_widget)
 
 	def removeWidgetAndData(self, child_widget):
 		data_index = child_widget.data_index
@@ -445,22 +816,29 @@ class MoveLayout(BaseLayout):
 		NOTE: this method assumes that there are already children visible.
 
 		NOTE: This method works for both vertical and horizontal layouts.
+
+		NOTE: Called directly (e.g. right after enableIncrementalFill or after an insert), the fill gets a budget of its
+		own instead of using the one left over from the last move, see runBudgetedFill.
 		"""
+		if self.needsFillBudget():
+			self.runBudgetedFill(self.fillInChildren)
+			return
+
 		real_pos = self.real_pos
 		real_size = self.real_size
 
 		# insert widget from first data entry if none are visible
+		first_index = self.get_first_index()
 		if not self.visible:
-			if not self.data:
+			if first_index >= len(self.data):
 				return
-			raw_data = self.data[0]
-			self.insertWidget(0)
+			self.insertWidget(first_index)
 
 		# fill widgets from top
 		first_child = self.visible[0]
 		while self.delta_first_condition(first_child):
 			data_index = first_child.data_index - 1
-			if data_index < 0:
+			if data_index < first_index or not self.fillBudgetLeft():
 				break
 			additional_data = self.additionalKwargsFillFirst(data_index, first_child)
 			self.addWidget(data_index, additional_data)
@@ -470,7 +848,7 @@ class MoveLayout(BaseLayout):
 		last_child = self.visible[-1]
 		while self.delta_last_condition(last_child):
 			data_index = last_child.data_index + 1
-			if data_index >= len(self.data):
+			if data_index >= len(self.data) or not self.fillBudgetLeft():
 				break
 			additional_data = self.additionalKwargsFillLast(data_index, last_child)
 			self.addWidget(data_index, additional_data)
@@ -590,6 +968,9 @@ class MoveLayout(BaseLayout):
 		"""
 		last_child = self.visible[-1]
 		while self.condition_last(last_child, delta):
+			if len(self.visible) == 1 and self.isFillIncremental():
+				# the fill is lagging behind, keep last_child as reference for continueFill
+				break
 			self.removeWidget(last_child)
 			if self.visible:
 				last_child = self.visible[-1]
@@ -602,7 +983,7 @@ class MoveLayout(BaseLayout):
 		"""
 		first_child = self.visible[0]
 		while not self.condition_second(first_child, delta):
-			if first_child.data_index > 0:
+			if first_child.data_index > self.get_first_index() and self.fillBudgetLeft():
 				first_index = first_child.data_index - 1
 				additional_data = self.additionalKwargsFillFirst(first_index, first_child)
 				self.addWidget(first_index, additional_data)
@@ -623,6 +1004,9 @@ class MoveLayout(BaseLayout):
 		"""
 		first_child = self.visible[0]
 		while self.condition_first(first_child, delta):
+			if len(self.visible) == 1 and self.isFillIncremental():
+				# the fill is lagging behind, keep first_child as reference for continueFill
+				break
 			self.removeWidget(first_child)
 			if self.visible:
 				first_child = self.visible[0]
@@ -635,7 +1019,7 @@ class MoveLayout(BaseLayout):
 		"""
 		last_child = self.visible[-1]
 		while not self.condition_penultimate(last_child, delta):
-			if last_child.data_index + 1 < len(self.data):
+			if last_child.data_index + 1 < len(self.data) and self.fillBudgetLeft():
 				last_index = last_child.data_index + 1
 				additional_data = self.additionalKwargsFillLast(last_index, last_child)
 				self.addWidget(last_index, additional_data)
@@ -650,17 +1034,343 @@ class MoveLayout(BaseLayout):
 		self.inspectPenultimate(delta)
 		self.inspectFirst(delta)
 
+	def enableIncrementalFill(self, fill_budget=0.004):
+		"""
+		By default, fillInChildren, inspectSecond and inspectPenultimate add children until their conditions are met,
+		no matter how many that takes. With incremental fill, children get added until fill_budget (seconds) is used
+		up. The remaining fill is scheduled for the next frame (see continueFill), where the slots within the frame get
+		filled before the ones within the margins.
+
+		NOTE: Until the fill is completed, there might be gaps on screen for a few frames. This is the price for not
+		blocking the rendering.
+		"""
+		self.fill_budget = fill_budget
+		self.incremental_fill = True
+
+	def disableIncrementalFill(self):
+		self.incremental_fill = False
+		if self.fill_event is not None:
+			self.fill_event.cancel()
+			self.fill_event = None
+			self.continueFill()
+
+	def enableLOD(self, speed=2000, zoom_rate=1, settle_delay=0.15):
+		"""
+		Level of detail: while the layout moves faster than speed (pixels per second) or zooms faster than zoom_rate
+		(relative change per second), children get added as their 'placeholder_type' instead of their 'child_type',
+		if their data declares one:
+
+			{'child_type': ..., 'placeholder_type': ..., 'init_data': {...}}
+
+		A placeholder is created from the placeholder_keys of 'init_data' only (its geometry). Once there has been no
+		fast motion for settle_delay seconds, the visible placeholders get replaced by their full children, see
+		upgradePlaceholders.
+
+		NOTE: Placeholder types need to be ChildWidgets. Nested layouts whose logic relies on the type of their visible
+		children (e.g. GridLayout calling its rows) must not declare placeholders for them.
+		"""
+		self.lod_speed = speed
+		self.lod_zoom_rate = zoom_rate
+		self.lod_settle_delay = settle_delay
+		self.placeholders = set()
+
+	def disableLOD(self):
+		self.upgradePlaceholders()
+		self.lod_speed = None
+
+	def get_placeholder_type(self, raw_data):
+		if not self.is_fast:
+			return None
+		return raw_data.get('placeholder_type')
+
+	def updateMotion(self, distance, threshold):
+		"""
+		Decides from the distance covered since the last motion whether the layout moves fast, see enableLOD. Once the
+		motion slows down below threshold, the placeholders get upgraded right away instead of after settle_delay.
+		"""
+		if self.lod_speed is None:
+			return
+		now = perf_counter()
+		# events within the same frame would otherwise look infinitely fast
+		elapsed = max(now - self.last_motion_time, 1 / 120)
+		self.last_motion_time = now
+		if distance / elapsed > threshold:
+			self.is_fast = True
+			if self.lod_event is not None:
+				self.lod_event.cancel()
+			self.lod_event = Clock.schedule_once(self.upgradePlaceholders, self.lod_settle_delay)
+		elif self.is_fast:
+			self.upgradePlaceholders()
+
+	def upgradePlaceholders(self, *args):
+		"""
+		Replaces all visible placeholders by their full children, at the position the placeholder has moved to.
+		"""
+		if self.lod_event is not None:
+			self.lod_event.cancel()
+		self.lod_event = None
+		self.is_fast = False
+		for placeholder in [child for child in self.visible if child in self.placeholders]:
+			additional_data = {}
+			for key in self.placeholder_keys:
+				value = getattr(placeholder, key)
+				additional_data[key] = list(value) if isinstance(value, list) else value
+			data_index = placeholder.data_index
+			self.deleteWidget(placeholder)
+			self.addWidget(data_index, additional_data)
+
+	def isFillIncremental(self):
+		return self.incremental_fill
+
+	def startFillBudget(self):
+		self.fill_deadline = perf_counter() + self.fill_budget
+
+	def needsFillBudget(self):
+		"""
+		Whether a fill has to start a budget of its own, i.e. incremental fill is enabled and the fill is not part of one
+		that has a budget already (move, continueFill or an enclosing fillInChildren / insertWidget).
+		"""
+		return self.incremental_fill and not self.is_filling
+
+	def runBudgetedFill(self, fill, *args):
+		self.is_filling = True
+		self.startFillBudget()
+		fill(*args)
+		self.is_filling = False
+
+	def fillBudgetLeft(self):
+		"""
+		Always True unless incremental fill is enabled. Once the budget is used up, the remaining fill gets scheduled
+		for the next frame and False is returned.
+		"""
+		if not self.incremental_fill or perf_counter() < self.fill_deadline:
+			return True
+		self.scheduleFill()
+		return False
+
+	def scheduleFill(self):
+		if self.fill_event is None:
+			self.fill_event = Clock.schedule_once(self.continueFill)
+
+	def continueFill(self, *args):
+		self.fill_event = None
+		self.runBudgetedFill(self.fillRemaining)
+
+	def fillRemaining(self):
+		self.relocateReference()
+		self.fillOnScreen()
+		self.fillMargins()
+		self.trimChildren()
+
+	def trimChildren(self):
+		"""
+		Removes the children at both ends that fillInChildren would not have added, e.g. after zooming in.
+		"""
+		while len(self.visible) > 1 and not self.delta_first_condition(self.visible[1]):
+			self.removeWidget(self.visible[0])
+		while len(self.visible) > 1 and not self.delta_last_condition(self.visible[-2]):
+			self.removeWidget(self.visible[-1])
+
+	def relocateReference(self):
+		"""
+		A fling further than the frame leaves the incremental fill with a single reference child (see inspectFirst /
+		inspectLast) that is out of sight by now. Filling from there would build all children in between first, hence
+		the reference gets replaced by the child at the top / left edge of the frame. Its data_index is derived from the
+		extents in data (bisected from the offset index if enabled), no child in between gets instantiated.
+		"""
+		if not self.visible or any(self.is_in_frame(child) for child in self.visible):
+			return
+		reference_child = self.visible[0]
+		data_index, distance = self.find_data_index(reference_child, self.get_frame_distance(reference_child))
+		additional_data = self.additionalKwargsRelocate(data_index, reference_child, distance)
+		for child in self.visible.copy():
+			self.removeWidget(child)
+		self.addWidget(data_index, additional_data)
+
+	def find_data_index(self, reference_child, distance) -> tuple:
+		"""
+		Returns the data_index of the element covering distance (in pixels, measured from the start of reference_child
+		along the layout direction, negative is before it) and the distance from reference_child to its start.
+		"""
+		scale = self.get_extent_scale(reference_child)
+		data_index = reference_child.data_index
+		first_index = self.get_first_index()
+		if self.offset_index is not None and scale == 1:
+			reference_offset = self.get_data_offset(data_index)
+			data_index = min(max(self.get_data_index_at(reference_offset + distance), first_index), len(self.data) - 1)
+			return data_index, self.get_data_offset(data_index) - reference_offset
+
+		offset = 0
+		if distance >= 0:
+			while data_index + 1 < len(self.data):
+				extent = self.get_index_extent(data_index) * scale
+				if offset + extent > distance:
+					break
+				offset += extent
+				data_index += 1
+		else:
+			while data_index > first_index and offset > distance:
+				data_index -= 1
+				offset -= self.get_index_extent(data_index) * scale
+		return data_index, offset
+
+	def get_extent_scale(self, reference_child):
+		"""
+		The ratio of the extent of a child on screen to the extent of its data, see ZoomLayout.
+		"""
+		return 1
+
+	def is_in_frame(self, child):
+		# TODO: raise NeedImplementationError ?
+		return True
+
+	def get_frame_distance(self, reference_child):
+		# TODO: raise NeedImplementationError ?
+		return 0
+
+	def get_index_extent(self, data_index):
+		# TODO: raise NeedImplementationError ?
+		return 0
+
+	def additionalKwargsRelocate(self, data_index, reference_child, distance):
+		# TODO: raise NeedImplementationError ?
+		return {}
+
+	def gap_first(self, first_child):
+		"""
+		This condition indicates that there is space within the frame before first_child, i.e. a child to be added in
+		front of first_child would be on screen.
+		"""
+		return False
+
+	def gap_last(self, last_child):
+		"""
+		This condition indicates that there is space within the frame after last_child.
+		"""
+		return False
+
+	def get_fill_frame(self):
+		"""
+		Returns the position and size of the frame that gap_first and gap_last refer to.
+		"""
+		return self.get_view_pos(), self.real_size
+
+	def fillOnScreen(self):
+		"""
+		Like fillInChildren, but only for children that will be (at least partially) within the frame.
+		"""
+		if not self.visible:
+			return
+
+		first_index = self.get_first_index()
+		first_child = self.visible[0]
+		while self.gap_first(first_child):
+			data_index = first_child.data_index - 1
+			if data_index < first_index or not self.fillBudgetLeft():
+				break
+			additional_data = self.additionalKwargsFillFirst(data_index, first_child)
+			self.addWidget(data_index, additional_data)
+			first_child = self.visible[0]
+
+		last_child = self.visible[-1]
+		while self.gap_last(last_child):
+			data_index = last_child.data_index + 1
+			if data_index >= len(self.data) or not self.fillBudgetLeft():
+				break
+			additional_data = self.additionalKwargsFillLast(data_index, last_child)
+			self.addWidget(data_index, additional_data)
+			last_child = self.visible[-1]
+
+	def fillMargins(self):
+		if self.visible:
+			self.fillInChildren()
+
+	def enableGroupTranslation(self):
+		"""
+		Instead of updating the real_pos of every visible (nested) child on move, the layout keeps a single scroll_offset
+		that gets applied as canvas translation. The children stay in local coordinates, hence moving is O(1) no matter
+		how many children are visible.
+
+		All conditions compare the children against the frame in local coordinates (see get_view_pos). For absolute
+		positions, e.g. in hit tests, use to_local / to_absolute.
+
+		NOTE: Everything drawn by the widgets children gets translated, including children defined in the .kv file. Draw
+		static decorations of the layout itself within its own canvas instead.
+
+		NOTE: This is meant for the layout on top (the anchor for nested layouts). Enable it before filling in children.
+		"""
+		if self.group_translation:
+			return
+		with self.canvas.before:
+			PushMatrix()
+			self.translate_instruction = Translate(0, 0)
+		with self.canvas.after:
+			PopMatrix()
+		self.scroll_offset = (0,0)
+		self.group_translation = True
+
+	def get_view_pos(self):
+		"""
+		The position of the layouts frame in the coordinates of its children. Without group translation, these are the
+		same as the layouts.
+		"""
+		if not self.group_translation:
+			return self.real_pos
+		return [self.real_pos[0] - self.scroll_offset[0], self.real_pos[1] - self.scroll_offset[1]]
+
+	def translateChildren(self, delta_x, delta_y):
+		self.scroll_offset = (self.scroll_offset[0] + delta_x, self.scroll_offset[1] + delta_y)
+		self.translate_instruction.xy = self.scroll_offset
+
+	def to_local(self, x, y):
+		"""
+		Converts absolute coordinates (e.g. of a touch) to the coordinates of the children.
+		"""
+		return x - self.scroll_offset[0], y - self.scroll_offset[1]
+
+	def to_absolute(self, real_pos):
+		return [real_pos[0] + self.scroll_offset[0], real_pos[1] + self.scroll_offset[1]]
+
+	def hit_test(self, x, y) -> list:
+		if not self.collideWidget(x, y):
+			return []
+		if self.group_translation:
+			x, y = self.to_local(x, y)
+		return [self] + self.hitTestChildren(x, y)
+
+	def hitTestChildren(self, x, y) -> list:
+		"""
+		NOTE: x, y need to be in the coordinates of the children already. Nested layouts share the coordinates of their
+		anchor, hence no further conversion is needed further down.
+		"""
+		child = self.get_child_at(x, y)
+		if child is None:
+			return []
+		if isinstance(child, MoveLayout):
+			return [child] + child.hitTestChildren(x, y)
+		return [child]
+
+	def get_child_at(self, x, y):
+		"""
+		Returns the visible child at x, y (in the coordinates of the children) or None. Oriented layouts bisect over the
+		positions of their visible children.
+		"""
+		for child in self.visible:
+			if child.collideWidget(x, y):
+				return child
+		return None
+
 	def check_delta_top(self, first_child):
-		return (self.real_pos[1] + self.real_size[1]) - (first_child.real_pos[1] + first_child.real_size[1])
+		return (self.get_view_pos()[1] + self.real_size[1]) - (first_child.real_pos[1] + first_child.real_size[1])
 
 	def check_delta_bottom(self, last_child):
-		return self.real_pos[1] - last_child.real_pos[1]
+		return self.get_view_pos()[1] - last_child.real_pos[1]
 
 	def check_delta_left(self, first_child):
-		return self.real_pos[0] - first_child.real_pos[0]
+		return self.get_view_pos()[0] - first_child.real_pos[0]
 
 	def check_delta_right(self, last_child):
-		return (self.real_pos[0] + self.real_size[0]) - (last_child.real_pos[0] + last_child.real_size[0])
+		return (self.get_view_pos()[0] + self.real_size[0]) - (last_child.real_pos[0] + last_child.real_size[0])
 
 	def checkDelta(self, delta_x, delta_y):
 		return delta_x, delta_y
@@ -674,12 +1384,21 @@ class MoveLayout(BaseLayout):
 			return
 
 		delta_x, delta_y = touch.dpos
+		self.updateMotion(hypot(delta_x, delta_y), self.lod_speed)
+
+		if self.incremental_fill:
+			self.startFillBudget()
+			self.is_filling = True
 
 		delta_x, delta_y = self.checkDelta(delta_x, delta_y)
 		self.inspect(delta_x, delta_y)
 
-		for child in self.visible:
-			child.updatePos([delta_x, delta_y])
+		if self.group_translation:
+			self.translateChildren(delta_x, delta_y)
+		else:
+			for child in self.visible:
+				child.updatePos([delta_x, delta_y])
+		self.is_filling = False
 
 		# we need to return delta_x, delta_y for nested layouts
 		return delta_x, delta_y
@@ -694,6 +1413,51 @@ vertical movement only, you wanna take a look at ScrollLayout.
 
 
 class VerticalLayout(MoveLayout):
+	def get_child_at(self, x, y):
+		# from top to bottom, the negated lower edges are ascending
+		visible_index = bisect_left(KeyView(self.visible, lambda child: -child.real_pos[1]), -y)
+		if visible_index < len(self.visible) and self.visible[visible_index].collideWidget(x, y):
+			return self.visible[visible_index]
+		return None
+
+	def gap_first(self, first_child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return frame_pos[1] + frame_size[1] > first_child.real_pos[1] + first_child.real_size[1]
+
+	def gap_last(self, last_child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return last_child.real_pos[1] > frame_pos[1]
+
+	def get_child_extent(self, child):
+		return child.real_size[1]
+
+	def is_in_frame(self, child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return child.real_pos[1] < frame_pos[1] + frame_size[1] and child.real_pos[1] + self.get_child_extent(child) > frame_pos[1]
+
+	def get_frame_distance(self, reference_child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return reference_child.real_pos[1] + self.get_child_extent(reference_child) - (frame_pos[1] + frame_size[1])
+
+	def get_index_extent(self, data_index):
+		return self.get_data_real_size(self.get_data_index(data_index))[1]
+
+	def additionalKwargsRelocate(self, data_index, reference_child, distance):
+		"""
+		Like additionalKwargsFillLast, but for the element distance below the top of reference_child.
+		"""
+		additional_data = self.additionalKwargsFillLast(data_index, reference_child)
+		real_pos = additional_data['real_pos']
+		shift = distance - self.get_child_extent(reference_child)
+		additional_data['real_pos'] = [real_pos[0], real_pos[1] - shift]
+		return additional_data
+
+	def get_data_extent(self, raw_data):
+		real_size = raw_data.get('init_data', {}).get('real_size')
+		if real_size is None:
+			return 0
+		return real_size[1]
+
 	def additionalKwargsInsert(self, data_index):
 		"""
 		Since children are not of the same type necessarily, the ypos of the inserted widget is the reference_pos[1] of
@@ -701,15 +1465,14 @@ class VerticalLayout(MoveLayout):
 		get it from there.
 		"""
 		data_index = self.get_data_index(data_index)
-		raw_data = self.data[data_index]
-		child_type = raw_data['child_type']
 
 		# NOTE: real_size has to be set in init_data
-		real_size = raw_data['init_data']['real_size']
+		real_size = self.get_data_real_size(data_index)
 
 		visible_index = self.get_visible_index(data_index)
 		if not self.visible:
-			real_pos = [self.real_pos[0], self.real_pos[1] + self.real_size[1] - real_size[1]]
+			view_pos = self.get_view_pos()
+			real_pos = [view_pos[0], view_pos[1] + self.real_size[1] - real_size[1]]
 		elif visible_index < len(self.visible):
 			reference_pos = self.visible[visible_index].real_pos
 			reference_size = self.visible[visible_index].real_size
@@ -738,7 +1501,8 @@ class VerticalLayout(MoveLayout):
 		else:
 			additional_data = self.additionalKwargsInsert(0)
 			real_size = additional_data['real_size']
-		real_pos = (self.real_pos[0], self.real_pos[1] + self.real_size[1] - real_size[1])
+		view_pos = self.get_view_pos()
+		real_pos = (view_pos[0], view_pos[1] + self.real_size[1] - real_size[1])
 
 		helper_widget = RealWidget(real_pos, real_size)
 		return helper_widget
@@ -748,7 +1512,7 @@ class VerticalLayout(MoveLayout):
 			real_pos = helper_child.real_pos
 			data_index = 0
 		else:
-			real_pos = self.real_pos
+			real_pos = self.get_view_pos()
 			data_index = -1
 		return real_pos, data_index
 
@@ -764,11 +1528,9 @@ class VerticalLayout(MoveLayout):
 		the last widget minus the filled-in real_size[1]. We store real_size in data, hence we get it from there.
 		"""
 		data_index = self.get_data_index(data_index)
-		raw_data = self.data[data_index]
-		child_type = raw_data['child_type']
 
 		# NOTE: real_size has to be set in init_data
-		real_size = raw_data['init_data']['real_size']
+		real_size = self.get_data_real_size(data_index)
 
 		reference_pos = reference_child.real_pos
 		real_pos = [reference_pos[0], reference_pos[1] - real_size[1]]
@@ -800,19 +1562,19 @@ class VerticalLayout(MoveLayout):
 			self.fillInChildren()
 
 	def delta_first(self, first_child):
-		return (self.real_pos[1] + self.real_size[1]) - (first_child.real_pos[1] - first_child.real_size[1])
+		return (self.get_view_pos()[1] + self.real_size[1]) - (first_child.real_pos[1] - first_child.real_size[1])
 
 	def delta_last(self, last_child):
-		return self.real_pos[1] - (last_child.real_pos[1] + 2 * last_child.real_size[1])
+		return self.get_view_pos()[1] - (last_child.real_pos[1] + 2 * last_child.real_size[1])
 
 	def delta_second(self, second_child):
-		return (self.real_pos[1] + self.real_size[1]) - second_child.real_pos[1]
+		return (self.get_view_pos()[1] + self.real_size[1]) - second_child.real_pos[1]
 
 	def delta_penultimate(self, penultimate_child):
-		return self.real_pos[1] - (penultimate_child.real_pos[1] + penultimate_child.real_size[1])
+		return self.get_view_pos()[1] - (penultimate_child.real_pos[1] + penultimate_child.real_size[1])
 
 	def check_delta_right(self, first_child):
-		return (self.real_pos[0] + self.real_size[0]) - (first_child.real_pos[0] + self.max_child_width)
+		return (self.get_view_pos()[0] + self.real_size[0]) - (first_child.real_pos[0] + self.max_child_width)
 
 	def checkDelta(self, delta_x, delta_y):
 		first_child = self.visible[0]
@@ -827,7 +1589,7 @@ class VerticalLayout(MoveLayout):
 		if delta_y < 0:
 			delta = self.check_delta_top(first_child)
 			if delta_y < delta:
-				if first_child.data_index == 0:
+				if first_child.data_index == self.get_first_index():
 					delta_y = delta
 
 		# check delta_x
@@ -855,6 +1617,46 @@ VerticalLayout - which is from top to bottom - and adapting from ypos to xpos),
 """
 
 class HorizontalLayout(MoveLayout):
+	def get_child_at(self, x, y):
+		visible_index = bisect_right(KeyView(self.visible, lambda child: child.real_pos[0] + child.real_size[0]), x)
+		if visible_index < len(self.visible) and self.visible[visible_index].collideWidget(x, y):
+			return self.visible[visible_index]
+		return None
+
+	def gap_first(self, first_child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return first_child.real_pos[0] > frame_pos[0]
+
+	def gap_last(self, last_child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return frame_pos[0] + frame_size[0] > last_child.real_pos[0] + last_child.real_size[0]
+
+	def is_in_frame(self, child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return child.real_pos[0] < frame_pos[0] + frame_size[0] and child.real_pos[0] + child.real_size[0] > frame_pos[0]
+
+	def get_frame_distance(self, reference_child):
+		return self.get_fill_frame()[0][0] - reference_child.real_pos[0]
+
+	def get_index_extent(self, data_index):
+		return self.get_data_real_size(self.get_data_index(data_index))[0]
+
+	def additionalKwargsRelocate(self, data_index, reference_child, distance):
+		"""
+		Like additionalKwargsFillLast, but for the element distance right of the left edge of reference_child.
+		"""
+		additional_data = self.additionalKwargsFillLast(data_index, reference_child)
+		real_pos = additional_data['real_pos']
+		shift = distance - reference_child.real_size[0]
+		additional_data['real_pos'] = [real_pos[0] + shift, real_pos[1]]
+		return additional_data
+
+	def get_data_extent(self, raw_data):
+		real_size = raw_data.get('init_data', {}).get('real_size')
+		if real_size is None:
+			return 0
+		return real_size[0]
+
 	def additionalKwargsInsert(self, data_index):
 		"""
 		HorizontalLayout algins the widgets from left to right, hence the inserted widget takes the place of the current
@@ -862,7 +1664,7 @@ class HorizontalLayout(MoveLayout):
 		"""
 		visible_index = self.get_visible_index(data_index)
 		if not self.visible:
-			real_pos = self.real_pos
+			real_pos = self.get_view_pos()
 		elif visible_index < len(self.visible):
 			reference_pos = self.visible[visible_index].real_pos
 			real_pos = reference_pos
@@ -887,19 +1689,20 @@ class HorizontalLayout(MoveLayout):
 	def createFirstHelperWidget(self):
 		first_child_raw = self.data[0]
 		real_size = first_child_raw['init_data']['real_size']
-		real_pos = self.real_pos
+		real_pos = self.get_view_pos()
 
 		helper_widget = RealWidget(real_pos, real_size)
 		return helper_widget
 
 	def fillInDelta(self, delta, helper_child):
 		if delta < 0:
-			real_pos = self.real_pos
+			real_pos = self.get_view_pos()
 			data_index = 0
 		else:
 			last_child_raw = self.data[0]
 			real_size = last_child_raw['init_data']['real_size']
-			real_pos = [self.real_pos[0] + self.real_size[0] - real_size[0], self.real_pos[1]]
+			view_pos = self.get_view_pos()
+			real_pos = [view_pos[0] + self.real_size[0] - real_size[0], view_pos[1]]
 			data_index = -1
 		return real_pos, data_index
 
@@ -909,11 +1712,9 @@ class HorizontalLayout(MoveLayout):
 		the first widget minus the filled-in real_size[0]. We store real_size in data, hence we get it from there.
 		"""
 		data_index = self.get_data_index(data_index)
-		raw_data = self.data[data_index]
-		child_type = raw_data['child_type']
 
 		# NOTE: real_size has to be set in init_data
-		real_size = raw_data['init_data']['real_size']
+		real_size = self.get_data_real_size(data_index)
 
 		reference_pos = reference_child.real_pos
 		real_pos = [reference_pos[0] - real_size[0], reference_pos[1]]
@@ -951,7 +1752,7 @@ class HorizontalLayout(MoveLayout):
 			self.fillInChildren()
 
 	def delta_first(self, first_child):
-		return self.real_pos[0] - (first_child.real_pos[0] + 2 * first_child.real_size[0])
+		return self.get_view_pos()[0] - (first_child.real_pos[0] + 2 * first_child.real_size[0])
 
 	def delta_first_condition(self, first_child):
 		return self.delta_first(first_child) < 0
@@ -960,7 +1761,7 @@ class HorizontalLayout(MoveLayout):
 		return delta < self.delta_first(first_child)
 
 	def delta_last(self, last_child):
-		return (self.real_pos[0] + self.real_size[0]) - (last_child.real_pos[0] - last_child.real_size[0])
+		return (self.get_view_pos()[0] + self.real_size[0]) - (last_child.real_pos[0] - last_child.real_size[0])
 
 	def delta_last_condition(self, last_child):
 		return self.delta_last(last_child) > 0
@@ -969,19 +1770,19 @@ class HorizontalLayout(MoveLayout):
 		return delta > self.delta_last(last_child)
 
 	def delta_second(self, second_child):
-		return self.real_pos[0] - (second_child.real_pos[0] + second_child.real_size[0])
+		return self.get_view_pos()[0] - (second_child.real_pos[0] + second_child.real_size[0])
 
 	def condition_second(self, second_child, delta):
 		return delta < self.delta_second(second_child)
 
 	def delta_penultimate(self, penultimate_child):
-		return (self.real_pos[0] + self.real_size[0]) - penultimate_child.real_pos[0]
+		return (self.get_view_pos()[0] + self.real_size[0]) - penultimate_child.real_pos[0]
 
 	def condition_penultimate(self, penultimate_child, delta):
 		return delta > self.delta_penultimate(penultimate_child)
 
 	def check_delta_top(self, first_child):
-		return (self.real_pos[1] + self.real_size[1]) - (first_child.real_pos[1] + self.max_child_height)
+		return (self.get_view_pos()[1] + self.real_size[1]) - (first_child.real_pos[1] + self.max_child_height)
 
 	def checkDelta(self, delta_x, delta_y):
 		first_child = self.visible[0]
@@ -1006,7 +1807,7 @@ class HorizontalLayout(MoveLayout):
 		if delta_x > 0:
 			delta = self.check_delta_left(first_child)
 			if delta_x > delta:
-				if first_child.data_index == 0:
+				if first_child.data_index == self.get_first_index():
 					delta_x = delta
 
 		return delta_x, delta_y
@@ -1073,6 +1874,7 @@ class ZoomChild(ChildWidget):
 	NOTE: the size of kv children has to be defined like real_size * resize_factor
 	"""
 	resize_factor = NumericProperty(1)
+	dirty_properties: list = ['real_size', 'resize_factor']
 	def resize(self, resize_factor):
 		self.resize_factor = resize_factor
 		for child in self.children:
@@ -1088,6 +1890,11 @@ class ZoomLayout(VerticalLayout):
 	max_zoom = 1
 	min_zoom = 1
 	current_zoom = 1
+	placeholder_keys: list = ['real_pos', 'real_size', 'resize_factor']
+	def get_data_extent(self, raw_data):
+		extent = super(ZoomLayout, self).get_data_extent(raw_data)
+		return extent * raw_data.get('init_data', {}).get('resize_factor', 1)
+
 	def additionalKwargsInsert(self, data_index):
 		additional_data = super(ZoomLayout, self).additionalKwargsInsert(data_index)
 
@@ -1117,22 +1924,101 @@ class ZoomLayout(VerticalLayout):
 			self.max_child_width = max_width
 
 	def additionalKwargsFillFirst(self, data_index, reference_child):
+		"""
+		The children are stacked by their scaled heights (real_size[1] * resize_factor).
+		"""
 		additional_data = super(ZoomLayout, self).additionalKwargsFillFirst(data_index, reference_child)
 		additional_data['resize_factor'] = reference_child.resize_factor
+		reference_pos = reference_child.real_pos
+		additional_data['real_pos'] = [
+			reference_pos[0],
+			reference_pos[1] + reference_child.real_size[1] * reference_child.resize_factor
+		]
 		return additional_data
 
 	def additionalKwargsFillLast(self, data_index, reference_child):
 		additional_data = super(ZoomLayout, self).additionalKwargsFillLast(data_index, reference_child)
 		additional_data['resize_factor'] = reference_child.resize_factor
+		real_size = self.get_data_real_size(self.get_data_index(data_index))
+		reference_pos = reference_child.real_pos
+		additional_data['real_pos'] = [reference_pos[0], reference_pos[1] - real_size[1] * reference_child.resize_factor]
 		return additional_data
 
+	def gap_first(self, first_child):
+		frame_pos, frame_size = self.get_fill_frame()
+		return frame_pos[1] + frame_size[1] > first_child.real_pos[1] + first_child.real_size[1] * first_child.resize_factor
+
+	def get_child_extent(self, child):
+		return child.real_size[1] * child.resize_factor
+
+	def get_extent_scale(self, reference_child):
+		return reference_child.resize_factor
+
 	def resizeWidgets(self, reference_widget, resize_factor):
-		self.max_child_width *= resize_factor
-		reference_index = reference_widget.data_index
+		self.resizeAround(reference_widget, reference_widget.real_pos[1], resize_factor)
+
+	def resizeAround(self, reference_child, focal_y, resize_factor):
+		"""
+		Resizes all visible children to resize_factor such that the point focal_y of reference_child stays where it is,
+		see restackAround.
+		"""
+		fraction = self.get_focal_fraction(reference_child, focal_y)
+		if reference_child.resize_factor:
+			self.max_child_width *= resize_factor / reference_child.resize_factor
 		for child in self.visible:
-			child_index = child.data_index
-			child.updatePos([0, (child_index - reference_index) * child.real_size[1] * (child.resize_factor - resize_factor)])
 			child.resize(resize_factor)
+		self.restackAround(reference_child, focal_y, fraction)
+
+	def get_focal_fraction(self, reference_child, focal_y):
+		"""
+		Returns where focal_y lies within reference_child, relative to its scaled height (0 at its bottom, 1 at its top).
+		"""
+		scaled_height = reference_child.real_size[1] * reference_child.resize_factor
+		return (focal_y - reference_child.real_pos[1]) / scaled_height if scaled_height else 0
+
+	def restackAround(self, reference_child, focal_y, fraction):
+		"""
+		Repositions the visible children after their scaled heights changed, such that fraction of reference_child lies
+		at focal_y again. The positions of the other children follow from the cumulative scaled heights of the visible
+		window, hence only the visible children are touched and children of different heights stay stacked without gaps.
+		"""
+		# bottoms[i] is the distance from the top of the first child to the bottom of the i-th child
+		bottoms = list(accumulate(child.real_size[1] * child.resize_factor for child in self.visible))
+		reference_index = self.visible.index(reference_child)
+		reference_height = bottoms[reference_index] - (bottoms[reference_index - 1] if reference_index else 0)
+		top = focal_y - fraction * reference_height + bottoms[reference_index]
+		for child, bottom in zip(self.visible, bottoms):
+			child.updatePos([0, top - bottom - child.real_pos[1]])
+
+	def get_zoom(self, zoom):
+		return min(max(zoom, self.min_zoom), self.max_zoom)
+
+	def get_focal_child(self, y):
+		"""
+		Returns the visible child at y (in the coordinates of the children), the closest one if y is not covered.
+		"""
+		for child in self.visible:
+			if child.real_pos[1] <= y:
+				return child
+		return self.visible[-1]
+
+	def zoomAt(self, scale, focal_point):
+		"""
+		Zooms by scale (relative to current_zoom, bounded by min_zoom and max_zoom) while the content at focal_point
+		(absolute coordinates, e.g. the center of a pinch) stays in place. Only the visible window gets reflowed, see
+		resizeAround, afterwards the children that left the frame are removed and the gaps are filled.
+		"""
+		if not self.visible:
+			return
+		zoom = self.get_zoom(self.current_zoom * scale)
+		if zoom == self.current_zoom:
+			return
+		self.updateMotion(abs(zoom / self.current_zoom - 1), self.lod_zoom_rate)
+		focal_y = self.to_local(*focal_point)[1]
+		self.resizeAround(self.get_focal_child(focal_y), focal_y, zoom)
+		self.current_zoom = zoom
+		self.trimChildren()
+		self.fillInChildren()
 
 	def resizeFillAndReposition(self, reference_widget, resize_factor):
 		"""
@@ -1142,13 +2028,13 @@ class ZoomLayout(VerticalLayout):
 		self.fillAndReposition()
 
 	def delta_first(self, first_child):
-		return (self.real_pos[1] + self.real_size[1]) - (first_child.real_pos[1] + first_child.real_size[1] * first_child.resize_factor)
+		return (self.get_view_pos()[1] + self.real_size[1]) - (first_child.real_pos[1] + first_child.real_size[1] * first_child.resize_factor)
 
 	def delta_last(self, last_child):
-		return self.real_pos[1] - (last_child.real_pos[1] + 2 * last_child.real_size[1] * last_child.resize_factor)
+		return self.get_view_pos()[1] - (last_child.real_pos[1] + 2 * last_child.real_size[1] * last_child.resize_factor)
 
 	def condition_penultimate(self, penultimate_child, delta_y):
-		return penultimate_child.real_pos[1] + penultimate_child.real_size[1] * penultimate_child.resize_factor + delta_y < self.real_pos[1] - self.visibility_margin_min
+		return penultimate_child.real_pos[1] + penultimate_child.real_size[1] * penultimate_child.resize_factor + delta_y < self.get_view_pos()[1]
 
 
 ## WITH FONTS
@@ -1159,15 +2045,67 @@ class BaseText(ZoomChild):
 	NOTE: the font_size of kv children has to be defined like int(this_font_size * resize_factor)
 	"""
 	this_text = StringProperty('')
-	this_font_size = NumericProperty(11)
+	this_font_size = NumericProperty(DEFAULT_FONT_SIZE)
+	dirty_properties: list = ['real_size', 'resize_factor', 'this_text', 'this_font_size']
 	def to_data(self) -> dict:
 		data = super(BaseText, self).to_data()
 		data['init_data']['this_text'] = self.this_text
 		data['init_data']['this_font_size'] = self.this_font_size
 		return data
 
+	def get_font_size(self):
+		return int(self.this_font_size * self.resize_factor)
+
+	def get_text_size(self) -> tuple:
+		"""
+		Returns the (width, height) of this_text as rendered with the current font size, see text_metrics.
+		"""
+		return text_metrics.measure(self.this_text, self.get_font_size())
+
+	@staticmethod
+	def get_data_font_size(init_data):
+		"""
+		The font size a BaseText would render with if it was created from init_data.
+		"""
+		return int(init_data.get('this_font_size', DEFAULT_FONT_SIZE) * init_data.get('resize_factor', 1))
+
 
 class FontLayout(ZoomLayout):
+	"""
+	A font change rescales real_size of the children by the ratio of the line heights (see text_metrics), resize_factor
+	is left to zooming. The records of children that are not visible keep their font size and real_size until they
+	get added again, see get_data_real_size.
+	"""
+	font_size = None
+	def get_font_ratio(self, init_data):
+		"""
+		Ratio of the line heights of the current font_size of the layout and the font size of init_data.
+		"""
+		if self.font_size is None:
+			return 1
+		record_font_size = init_data.get('this_font_size', self.font_size)
+		if record_font_size == self.font_size:
+			return 1
+		return text_metrics.line_height(self.font_size) / text_metrics.line_height(record_font_size)
+
+	def get_data_real_size(self, data_index):
+		real_size = super(FontLayout, self).get_data_real_size(data_index)
+		ratio = self.get_font_ratio(self.data[data_index]['init_data'])
+		if ratio == 1:
+			return real_size
+		return [real_size[0] * ratio, real_size[1] * ratio]
+
+	def addFontKwargs(self, data_index, additional_data):
+		"""
+		Children created from records of an older font size get the current one together with the rescaled real_size.
+		"""
+		data_index = self.get_data_index(data_index)
+		if self.get_font_ratio(self.data[data_index]['init_data']) != 1:
+			additional_data['real_size'] = self.get_data_real_size(data_index)
+		if self.font_size is not None:
+			additional_data['this_font_size'] = self.font_size
+		return additional_data
+
 	def additionalKwargsInsert(self, data_index):
 		additional_data = super(FontLayout, self).additionalKwargsInsert(data_index)
 
@@ -1183,41 +2121,53 @@ class FontLayout(ZoomLayout):
 			font_size = self.visible[visible_index].this_font_size
 
 		additional_data['this_font_size'] = font_size
-		return additional_data
+		return self.addFontKwargs(data_index, additional_data)
 
 	def addWidget(self, data_index, additional_data):
 		super(FontLayout, self).addWidget(data_index, additional_data)
 
-	def additionalKwargsFillFirst(self, reference_child):
-		additional_data = super(FontLayout, self).additionalKwargsFillFirst(reference_child)
+	def additionalKwargsFillFirst(self, data_index, reference_child):
+		additional_data = super(FontLayout, self).additionalKwargsFillFirst(data_index, reference_child)
 		additional_data['this_font_size'] = reference_child.this_font_size
-		return additional_data
+		return self.addFontKwargs(data_index, additional_data)
 
-	def additionalKwargsFillLast(self, reference_child):
-		additional_data = super(FontLayout, self).additionalKwargsFillLast(reference_child)
+	def additionalKwargsFillLast(self, data_index, reference_child):
+		additional_data = super(FontLayout, self).additionalKwargsFillLast(data_index, reference_child)
 		additional_data['this_font_size'] = reference_child.this_font_size
-		return additional_data
+		return self.addFontKwargs(data_index, additional_data)
 
 	def updateFontSize(self, reference_widget, font_size):
 		# TODO
-		# propagate font_size to children
-		# resize all children
 		# remove / add widgets from visible / data
+		previous_font_size = reference_widget.this_font_size
+		self.font_size = font_size
 		for child in self.visible:
 			child.this_font_size = font_size
-		self.resizeWidgetsToFont(reference_widget, font_size)
+		self.resizeWidgetsToFont(reference_widget, font_size, previous_font_size)
 
-	def resizeWidgetsToFont(self, reference_widget, font_size):
+	def resizeWidgetsToFont(self, reference_widget, font_size, previous_font_size=None):
 		"""
 		NOTE: Treating a change in font_size the same way as resizing widgets is on purpose! since all related widgets
 		need to be resized in an according manner such that the new layout with the changed font_size stays
 		proportionally the same.
+
+		real_size of the visible children gets multiplied by the ratio of the line heights of both font sizes (measured
+		once per font size, see text_metrics), resize_factor (the zoom) stays untouched. The bottom of reference_widget
+		stays in place. Without previous_font_size, the height of reference_widget serves as the previous line height.
 		"""
-		helper_widget = type(reference_widget)(-1)  # BaseChild needs an index, chose -1 to fulifll that.
-		helper_widget.this_font_size = font_size
-		helper_widget.this_text = 'H'
-		refactor_size = helper_widget.real_size[1] / reference_widget.real_size[1]
-		self.resizeFillAndReposition(reference_widget, resize_factor)
+		line_height = text_metrics.line_height(font_size)
+		if previous_font_size is None:
+			previous_line_height = reference_widget.real_size[1]
+		else:
+			previous_line_height = text_metrics.line_height(previous_font_size)
+		ratio = line_height / previous_line_height
+		focal_y = reference_widget.real_pos[1]
+		self.max_child_width *= ratio
+		for child in self.visible:
+			child.updateSize([child.real_size[0] * ratio, child.real_size[1] * ratio])
+		self.restackAround(reference_widget, focal_y, 0)
+		self.trimChildren()
+		self.fillInChildren()
 
 
 # MARGIN
@@ -1294,3 +2244,17 @@ class FontMarginLayout(ZoomMarginLayout, FontLayout):
 
 if __name__ == '__main__':
 	print("Testing the syntactically correctness.")
+
+	# after a fling further than the frame, the first budgeted frame only creates children within the frame
+	layout = ScrollLayout(real_pos=(0,0), real_size=(300,100))
+	layout.data = [{'child_type': ChildWidget, 'init_data': {'real_size': [300, 10]}} for _ in range(500)]
+	layout.fillInChildren()
+	layout.enableIncrementalFill(0.0002)
+	touch = Touch()
+	touch.updateDpos((0, 182.4))
+	layout.move(touch)
+	before = set(layout.visible)
+	layout.fill_event.cancel()
+	layout.continueFill()
+	assert all(layout.is_in_frame(child) for child in layout.visible if child not in before)
+	print("Incremental fill after a fling starts within the frame.")
@@ -0,0 +1,863 @@
+from array import array
+from collections import OrderedDict
+from collections.abc import Mapping, MutableMapping
+from copy import deepcopy
+from math import isnan
+
+
+"""
+Alternative containers for BaseLayout.data. They all present the indexing interface the layouts use on lists, that is
+len, data[data_index], data[data_index] = raw_data, insert, pop and append, where data[data_index] behaves like
+{'child_type': ChildWidget, 'init_data': dict}.
+"""
+
+
+# COLUMNAR
+
+"""
+NOTES:
+
+The records returned by ColumnarData are views on the columns, hence updates to their 'init_data' are written to the
+columns directly. Since they are referring to a data_index, they are only valid until the next insert / pop.
+"""
+
+NAN = float('nan')
+
+class ColumnarInitData(MutableMapping):
+	"""
+	View on the 'init_data' of one element of ColumnarData. real_size and resize_factor are read from / written to the
+	columns, all other fields live in the side table.
+	"""
+	def __init__(self, container, data_index):
+		self.container = container
+		self.data_index = data_index
+
+	def _extras(self, create=False):
+		extras = self.container.extras[self.data_index]
+		if extras is None and create:
+			extras = {}
+			self.container.extras[self.data_index] = extras
+		return extras
+
+	def __getitem__(self, key):
+		container = self.container
+		if key == 'real_size':
+			width = container.widths[self.data_index]
+			if isnan(width):
+				raise KeyError(key)
+			return [width, container.heights[self.data_index]]
+		if key == 'resize_factor':
+			resize_factor = container.resize_factors[self.data_index]
+			if isnan(resize_factor):
+				raise KeyError(key)
+			return resize_factor
+		extras = self._extras()
+		if extras is None:
+			raise KeyError(key)
+		return extras[key]
+
+	def __setitem__(self, key, value):
+		container = self.container
+		if key == 'real_size':
+			container.widths[self.data_index] = value[0]
+			container.heights[self.data_index] = value[1]
+		elif key == 'resize_factor':
+			container.resize_factors[self.data_index] = value
+		else:
+			self._extras(create=True)[key] = value
+
+	def __delitem__(self, key):
+		container = self.container
+		if key == 'real_size':
+			if isnan(container.widths[self.data_index]):
+				raise KeyError(key)
+			container.widths[self.data_index] = NAN
+			container.heights[self.data_index] = NAN
+		elif key == 'resize_factor':
+			if isnan(container.resize_factors[self.data_index]):
+				raise KeyError(key)
+			container.resize_factors[self.data_index] = NAN
+		else:
+			extras = self._extras()
+			if extras is None:
+				raise KeyError(key)
+			del extras[key]
+
+	def __iter__(self):
+		container = self.container
+		if not isnan(container.widths[self.data_index]):
+			yield 'real_size'
+		if not isnan(container.resize_factors[self.data_index]):
+			yield 'resize_factor'
+		extras = self._extras()
+		if extras:
+			yield from extras
+
+	def __len__(self):
+		return sum(1 for key in self)
+
+	def __repr__(self):
+		return repr(dict(self))
+
+
+class ColumnarRecord(Mapping):
+	"""
+	View on one element of ColumnarData, behaving like {'child_type': ChildWidget, 'init_data': dict}. Elements that were
+	added as empty dicts (e.g. empty cells of a row) are empty.
+	"""
+	def __init__(self, container, data_index):
+		self.container = container
+		self.data_index = data_index
+
+	def is_empty(self):
+		return self.container.codes[self.data_index] == 0
+
+	def __getitem__(self, key):
+		container = self.container
+		if not self.is_empty():
+			if key == 'child_type':
+				return container.child_types[container.codes[self.data_index] - 1]
+			if key == 'init_data':
+				return ColumnarInitData(container, self.data_index)
+		raw_extras = container.raw_extras[self.data_index]
+		if raw_extras is None:
+			raise KeyError(key)
+		return raw_extras[key]
+
+	def __iter__(self):
+		if not self.is_empty():
+			yield 'child_type'
+			yield 'init_data'
+		raw_extras = self.container.raw_extras[self.data_index]
+		if raw_extras:
+			yield from raw_extras
+
+	def __len__(self):
+		return sum(1 for key in self)
+
+	def __repr__(self):
+		return repr(dict(self))
+
+
+class ColumnarData(object):
+	"""
+	Array backed storage for BaseLayout.data. Child types are stored as small integer codes, real_size and
+	resize_factor as contiguous 'd' arrays (NaN if not set) and all other fields of 'init_data' in a side table (None if
+	there are none).
+
+	NOTE: Values of real_size are stored as floats and copied on write, hence they are not shared with the widgets.
+	"""
+	def __init__(self, data=[]):
+		self.child_types = []
+		self.type_codes = {}
+		self.codes = array('H')
+		self.widths = array('d')
+		self.heights = array('d')
+		self.resize_factors = array('d')
+		self.extras = []
+		self.raw_extras = []
+		self.extend(data)
+
+	def __len__(self):
+		return len(self.codes)
+
+	def _index(self, data_index):
+		if data_index < 0:
+			data_index += len(self.codes)
+		if not 0 <= data_index < len(self.codes):
+			raise IndexError('ColumnarData index out of range')
+		return data_index
+
+	def get_type_code(self, child_type):
+		code = self.type_codes.get(child_type)
+		if code is None:
+			self.child_types.append(child_type)
+			code = len(self.child_types)
+			self.type_codes[child_type] = code
+		return code
+
+	def _split(self, raw_data):
+		"""
+		Splits raw_data into the values of the columns and both side tables.
+		"""
+		if not raw_data:
+			return 0, NAN, NAN, NAN, None, None
+		code = self.get_type_code(raw_data['child_type'])
+		extras = None
+		width = height = resize_factor = NAN
+		for key, value in raw_data['init_data'].items():
+			if key == 'real_size':
+				width, height = value[0], value[1]
+			elif key == 'resize_factor':
+				resize_factor = value
+			else:
+				if extras is None:
+					extras = {}
+				extras[key] = value
+		raw_extras = None
+		for key, value in raw_data.items():
+			if key != 'child_type' and key != 'init_data':
+				if raw_extras is None:
+					raw_extras = {}
+				raw_extras[key] = value
+		return code, width, height, resize_factor, extras, raw_extras
+
+	def __getitem__(self, data_index):
+		return ColumnarRecord(self, self._index(data_index))
+
+	def __setitem__(self, data_index, raw_data):
+		data_index = self._index(data_index)
+		code, width, height, resize_factor, extras, raw_extras = self._split(raw_data)
+		self.codes[data_index] = code
+		self.widths[data_index] = width
+		self.heights[data_index] = height
+		self.resize_factors[data_index] = resize_factor
+		self.extras[data_index] = extras
+		self.raw_extras[data_index] = raw_extras
+
+	def __iter__(self):
+		for data_index in range(len(self.codes)):
+			yield ColumnarRecord(self, data_index)
+
+	def insert(self, data_index, raw_data):
+		# same clamping as list.insert
+		if data_index < 0:
+			data_index = max(0, data_index + len(self.codes))
+		data_index = min(data_index, len(self.codes))
+		code, width, height, resize_factor, extras, raw_extras = self._split(raw_data)
+		self.codes.insert(data_index, code)
+		self.widths.insert(data_index, width)
+		self.heights.insert(data_index, height)
+		self.resize_factors.insert(data_index, resize_factor)
+		self.extras.insert(data_index, extras)
+		self.raw_extras.insert(data_index, raw_extras)
+
+	def append(self, raw_data):
+		self.insert(len(self.codes), raw_data)
+
+	def extend(self, data):
+		for raw_data in data:
+			self.append(raw_data)
+
+	def pop(self, data_index=-1):
+		data_index = self._index(data_index)
+		raw_data = self.to_dict(data_index)
+		self.codes.pop(data_index)
+		self.widths.pop(data_index)
+		self.heights.pop(data_index)
+		self.resize_factors.pop(data_index)
+		self.extras.pop(data_index)
+		self.raw_extras.pop(data_index)
+		return raw_data
+
+	def to_dict(self, data_index):
+		"""
+		Materializes the element at data_index as plain dict.
+		"""
+		record = self[data_index]
+		raw_data = dict(record)
+		if 'init_data' in raw_data:
+			raw_data['init_data'] = dict(raw_data['init_data'])
+		return raw_data
+
+	def to_list(self) -> list:
+		return [self.to_dict(data_index) for data_index in range(len(self.codes))]
+
+	def get_real_size(self, data_index):
+		"""
+		Fast path for the layouts geometry reads, avoids creating a record view.
+		"""
+		data_index = self._index(data_index)
+		return [self.widths[data_index], self.heights[data_index]]
+
+	def get_resize_factor(self, data_index):
+		return self.resize_factors[self._index(data_index)]
+
+	def column(self, name):
+		"""
+		Returns the contiguous column 'widths', 'heights' or 'resize_factors' (e.g. for memoryview / numpy.frombuffer).
+		"""
+		return getattr(self, name)
+
+
+# NORMALIZED
+
+"""
+NOTES:
+
+For n nested layouts, the parents data used to hold the (serialized) leaf data of their children, hence it got stored
+and written n times. With a RecordStore, every leaf record is stored exactly once. The data lists of the layouts hold
+RecordRefs to them, the records of nested layouts stay in their parents data and only keep a reference to the nested
+layouts data list.
+"""
+
+class RecordRef(Mapping):
+	"""
+	Reference to a leaf record within a RecordStore, behaving like the record itself.
+	"""
+	__slots__ = ('store', 'key')
+	def __init__(self, store, key):
+		self.store = store
+		self.key = key
+
+	def get_record(self) -> dict:
+		return self.store.records[self.key]
+
+	def set(self, raw_data):
+		self.store.set(self.key, raw_data)
+
+	def __getitem__(self, key):
+		return self.store.records[self.key][key]
+
+	def __iter__(self):
+		return iter(self.store.records[self.key])
+
+	def __len__(self):
+		return len(self.store.records[self.key])
+
+	def __repr__(self):
+		return 'RecordRef({}, {!r})'.format(self.key, self.store.records[self.key])
+
+
+class RecordStore(object):
+	"""
+	Shared, normalized storage of the leaf records of nested layouts, see BaseLayout.normalizeData.
+	"""
+	def __init__(self):
+		self.records = {}
+		self.next_key = 0
+
+	def __len__(self):
+		return len(self.records)
+
+	def __contains__(self, key):
+		return key in self.records
+
+	@staticmethod
+	def is_nested(raw_data):
+		"""
+		Records of nested layouts hold the data of their children (wrappers that have not been instantiated yet hold
+		their wrapped_data instead), all other (non empty) records are leaves.
+		"""
+		init_data = raw_data.get('init_data', {})
+		return 'data' in init_data or 'wrapped_data' in init_data
+
+	def add(self, raw_data) -> RecordRef:
+		key = self.next_key
+		self.next_key += 1
+		self.records[key] = raw_data
+		return RecordRef(self, key)
+
+	def get(self, key) -> dict:
+		return self.records[key]
+
+	def set(self, key, raw_data):
+		if isinstance(raw_data, RecordRef):
+			raw_data = raw_data.get_record()
+		self.records[key] = raw_data
+
+	def remove(self, key):
+		self.records.pop(key, None)
+
+	def store(self, raw_data):
+		"""
+		Returns what should be put into a layouts data for raw_data: a RecordRef for leaf records, the (normalized) record
+		itself for nested ones.
+		"""
+		if isinstance(raw_data, RecordRef) or not raw_data:
+			return raw_data
+		if self.is_nested(raw_data):
+			if 'data' in raw_data['init_data']:
+				self.normalize(raw_data['init_data']['data'])
+			return raw_data
+		return self.add(raw_data)
+
+	def normalize(self, data):
+		"""
+		Replaces all leaf records within data (recursively) by RecordRefs, in place. Empty records are skipped, which
+		also keeps the placeholders of SparseData from being stored.
+		"""
+		for data_index, raw_data in iter_filled(data):
+			stored = self.store(raw_data)
+			if stored is not raw_data:
+				data[data_index] = stored
+
+	def discard(self, raw_data):
+		"""
+		Removes the leaf records of raw_data (recursively) from the store.
+		"""
+		if isinstance(raw_data, RecordRef):
+			self.remove(raw_data.key)
+		elif raw_data and self.is_nested(raw_data):
+			for child_data in raw_data['init_data'].get('data', []):
+				self.discard(child_data)
+
+	def resolve(self, data) -> list:
+		"""
+		Returns a copy of data with all RecordRefs replaced by their records, e.g. for persisting.
+		"""
+		resolved = []
+		for raw_data in data:
+			if isinstance(raw_data, RecordRef):
+				raw_data = raw_data.get_record()
+			elif raw_data and 'data' in raw_data.get('init_data', {}):
+				raw_data = dict(raw_data)
+				raw_data['init_data'] = dict(raw_data['init_data'])
+				raw_data['init_data']['data'] = self.resolve(raw_data['init_data']['data'])
+			resolved.append(raw_data)
+		return resolved
+
+
+# PAGED
+
+class DataProvider(object):
+	"""
+	Protocol for lazily loaded data. Only __len__ and get are required, get returns the list of raw_data for the given
+	range of data indices.
+
+	get_size_hint is optional and can return real_size of an element without loading it (None if unknown). set, insert
+	and pop are optional as well, without insert / pop the length of the data is fixed.
+	"""
+	def __len__(self):
+		raise NotImplementedError
+
+	def get(self, data_range: range) -> list:
+		raise NotImplementedError
+
+	def get_size_hint(self, data_index):
+		return None
+
+
+def is_data_provider(data):
+	return not hasattr(data, '__getitem__') and callable(getattr(data, 'get', None)) and hasattr(data, '__len__')
+
+
+class PagedData(object):
+	"""
+	Presents a DataProvider as BaseLayout.data. The data gets loaded in chunks of chunk_size elements, at most
+	max_chunks of them are kept resident (least recently used ones get evicted).
+
+	Written elements (data[data_index] = raw_data) are passed to provider.set if the provider has such a method,
+	otherwise they are kept in modified.
+
+	NOTE: Changes to a loaded record itself (e.g. 'real_pos' updated by addWidget) get lost once its chunk is evicted.
+	"""
+	def __init__(self, provider, chunk_size=256, max_chunks=16):
+		self.provider = provider
+		self.chunk_size = chunk_size
+		self.max_chunks = max_chunks
+		self.chunks = OrderedDict()
+		self.modified = {}
+		self.loads = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self.provider)
+
+	def _index(self, data_index):
+		length = len(self.provider)
+		if data_index < 0:
+			data_index += length
+		if not 0 <= data_index < length:
+			raise IndexError('PagedData index out of range')
+		return data_index
+
+	def get_chunk(self, chunk_index) -> list:
+		chunk = self.chunks.get(chunk_index)
+		if chunk is not None:
+			self.chunks.move_to_end(chunk_index)
+			return chunk
+		start = chunk_index * self.chunk_size
+		stop = min(start + self.chunk_size, len(self.provider))
+		chunk = list(self.provider.get(range(start, stop)))
+		self.loads += 1
+		self.chunks[chunk_index] = chunk
+		while len(self.chunks) > self.max_chunks:
+			self.chunks.popitem(last=False)
+			self.evictions += 1
+		return chunk
+
+	def is_resident(self, data_index):
+		return data_index in self.modified or data_index // self.chunk_size in self.chunks
+
+	def __getitem__(self, data_index):
+		data_index = self._index(data_index)
+		raw_data = self.modified.get(data_index)
+		if raw_data is not None:
+			return raw_data
+		chunk_index, offset = divmod(data_index, self.chunk_size)
+		return self.get_chunk(chunk_index)[offset]
+
+	def __setitem__(self, data_index, raw_data):
+		data_index = self._index(data_index)
+		set_data = getattr(self.provider, 'set', None)
+		if set_data is None:
+			self.modified[data_index] = raw_data
+		else:
+			set_data(data_index, raw_data)
+		chunk_index, offset = divmod(data_index, self.chunk_size)
+		chunk = self.chunks.get(chunk_index)
+		if chunk is not None:
+			chunk[offset] = raw_data
+
+	def __iter__(self):
+		for data_index in range(len(self.provider)):
+			yield self[data_index]
+
+	def get_real_size(self, data_index):
+		"""
+		Fast path for the layouts geometry reads (see BaseLayout.get_data_real_size). Uses the providers size hint for
+		elements that are not resident, so that no chunk needs to be loaded.
+		"""
+		data_index = self._index(data_index)
+		if not self.is_resident(data_index):
+			real_size = self.provider.get_size_hint(data_index)
+			if real_size is not None:
+				return real_size
+		return self[data_index]['init_data']['real_size']
+
+	def invalidate(self):
+		"""
+		Drops all resident chunks and modifications, e.g. after the providers data changed.
+		"""
+		self.chunks = OrderedDict()
+		self.modified = {}
+
+	def _shift_modified(self, data_index, shift):
+		modified = {}
+		for index, raw_data in self.modified.items():
+			if index >= data_index:
+				index += shift
+			modified[index] = raw_data
+		self.modified = modified
+
+	def insert(self, data_index, raw_data):
+		insert = getattr(self.provider, 'insert', None)
+		if insert is None:
+			raise TypeError('{} does not support inserting data'.format(type(self.provider).__name__))
+		length = len(self.provider)
+		if data_index < 0:
+			data_index = max(0, data_index + length)
+		data_index = min(data_index, length)
+		insert(data_index, raw_data)
+		self.chunks = OrderedDict()
+		self._shift_modified(data_index, 1)
+
+	def append(self, raw_data):
+		self.insert(len(self.provider), raw_data)
+
+	def pop(self, data_index=-1):
+		pop = getattr(self.provider, 'pop', None)
+		if pop is None:
+			raise TypeError('{} does not support removing data'.format(type(self.provider).__name__))
+		data_index = self._index(data_index)
+		raw_data = self.modified.pop(data_index, None)
+		popped = pop(data_index)
+		if raw_data is None:
+			raw_data = popped
+		self.chunks = OrderedDict()
+		self._shift_modified(data_index + 1, -1)
+		return raw_data
+
+	def stats(self) -> dict:
+		return {
+			'loads': self.loads,
+			'evictions': self.evictions,
+			'resident': sum(len(chunk) for chunk in self.chunks.values()),
+			'modified': len(self.modified)
+		}
+
+
+# SPARSE
+
+"""
+NOTES:
+
+For mostly empty grids, SparseData is meant as the data of RowLayout (cells) and GridLayout (rows). Together they form
+a two level dictionary of keys: row data_index -> column data_index -> record, where neither empty rows nor empty cells
+are stored at all.
+"""
+
+class SparseData(object):
+	"""
+	Dictionary of keys storage for BaseLayout.data. Only non empty records are stored (data_index -> raw_data), reading
+	an element that is not stored returns a copy of empty_record ({} if it is None), writing an empty record removes the
+	stored one.
+
+	NOTE: insert and pop shift the keys of all stored records after data_index, hence they are O(number of stored
+	records) instead of O(len).
+	"""
+	def __init__(self, length=0, records=None, empty_record=None):
+		self.length = length
+		self.records = {} if records is None else dict(records)
+		self.empty_record = empty_record
+
+	@classmethod
+	def from_data(cls, data, empty_record=None):
+		records = {data_index: raw_data for data_index, raw_data in enumerate(data) if raw_data}
+		return cls(len(data), records, empty_record)
+
+	def __len__(self):
+		return self.length
+
+	def _index(self, data_index):
+		if data_index < 0:
+			data_index += self.length
+		if not 0 <= data_index < self.length:
+			raise IndexError('SparseData index out of range')
+		return data_index
+
+	def get_empty_record(self) -> dict:
+		if self.empty_record is None:
+			return {}
+		return deepcopy(self.empty_record)
+
+	def is_stored(self, data_index):
+		return self._index(data_index) in self.records
+
+	def __getitem__(self, data_index):
+		if isinstance(data_index, slice):
+			return [self[i] for i in range(*data_index.indices(self.length))]
+		raw_data = self.records.get(self._index(data_index))
+		if raw_data is None:
+			return self.get_empty_record()
+		return raw_data
+
+	def __setitem__(self, data_index, raw_data):
+		data_index = self._index(data_index)
+		if raw_data:
+			self.records[data_index] = raw_data
+		else:
+			self.records.pop(data_index, None)
+
+	def __iter__(self):
+		for data_index in range(self.length):
+			yield self[data_index]
+
+	def _shift(self, data_index, shift):
+		if data_index >= self.length:
+			# nothing stored after data_index, e.g. when appending via insert
+			return
+		self.records = {
+			index + shift if index >= data_index else index: raw_data for index, raw_data in self.records.items()
+		}
+
+	def insert(self, data_index, raw_data):
+		if data_index < 0:
+			data_index = max(0, data_index + self.length)
+		data_index = min(data_index, self.length)
+		self._shift(data_index, 1)
+		self.length += 1
+		if raw_data:
+			self.records[data_index] = raw_data
+
+	def append(self, raw_data):
+		if raw_data:
+			self.records[self.length] = raw_data
+		self.length += 1
+
+	def extend(self, data):
+		for raw_data in data:
+			self.append(raw_data)
+
+	def pop(self, data_index=-1):
+		"""
+		Returns the removed record, {} if it was not stored (and NOT the empty_record, so that inserting it again does
+		not store it).
+		"""
+		data_index = self._index(data_index)
+		raw_data = self.records.pop(data_index, {})
+		self._shift(data_index + 1, -1)
+		self.length -= 1
+		return raw_data
+
+	def items(self) -> list:
+		"""
+		Returns the stored (data_index, raw_data) pairs, sorted by data_index.
+		"""
+		return sorted(self.records.items(), key=lambda item: item[0])
+
+	def to_list(self) -> list:
+		return [self.records.get(data_index, {}) for data_index in range(self.length)]
+
+	def stats(self) -> dict:
+		return {
+			'length': self.length,
+			'stored': len(self.records),
+			'density': len(self.records) / self.length if self.length else 0
+		}
+
+
+def iter_filled(data):
+	"""
+	Yields (data_index, raw_data) for the non empty records of data. For SparseData only the stored records are visited.
+	"""
+	if isinstance(data, SparseData):
+		yield from data.items()
+		return
+	for data_index, raw_data in enumerate(data):
+		if raw_data:
+			yield data_index, raw_data
+
+
+# VIEWS
+
+class DataView(object):
+	"""
+	Sorted and / or filtered view on a data container (a list or any of the containers above). indices maps the
+	positions within the view to data indices of data, hence sorting and filtering neither moves nor copies any record.
+	See MoveLayout.sortData and MoveLayout.filterData.
+
+	Sort keys are read from 'init_data' once per field (or key function) and cached as a list together with the sorted
+	order, hence switching between fields or the direction only sorts once per field. The caches get dropped on every
+	write through the view.
+
+	NOTE: Inserted records are appended to data and shown at the given position, the view is not sorted / filtered again
+	until the next refresh.
+	"""
+	def __init__(self, data):
+		self.data = data
+		self.indices = array('q', range(len(data)))
+		self.sort_field = None
+		self.sort_key = None
+		self.reverse = False
+		self.predicate = None
+		self.filter_field = None
+		self.keys = {}
+		self.orders = {}
+
+	def __len__(self):
+		return len(self.indices)
+
+	def _index(self, data_index):
+		if data_index < 0:
+			data_index += len(self.indices)
+		if not 0 <= data_index < len(self.indices):
+			raise IndexError('DataView index out of range')
+		return data_index
+
+	def source_index(self, data_index):
+		"""
+		Returns the data index within data of the element at data_index of the view.
+		"""
+		return self.indices[self._index(data_index)]
+
+	def __getitem__(self, data_index):
+		if isinstance(data_index, slice):
+			return [self.data[index] for index in self.indices[data_index]]
+		return self.data[self.source_index(data_index)]
+
+	def __setitem__(self, data_index, raw_data):
+		self.data[self.source_index(data_index)] = raw_data
+		self.invalidate()
+
+	def __iter__(self):
+		data = self.data
+		for index in self.indices:
+			yield data[index]
+
+	def get_real_size(self, data_index):
+		source_index = self.source_index(data_index)
+		get_real_size = getattr(self.data, 'get_real_size', None)
+		if get_real_size is not None:
+			return get_real_size(source_index)
+		return self.data[source_index]['init_data']['real_size']
+
+	@staticmethod
+	def get_field(raw_data, field):
+		if not raw_data:
+			return None
+		return raw_data['init_data'].get(field)
+
+	def get_keys(self, field=None, key=None) -> list:
+		"""
+		Returns the sort keys of all elements of data (in the order of data): key(raw_data) if key is given, the value of
+		field in 'init_data' otherwise.
+		"""
+		cache_key = key if key is not None else field
+		keys = self.keys.get(cache_key)
+		if keys is None:
+			if key is None:
+				keys = [self.get_field(raw_data, field) for raw_data in self.data]
+			else:
+				keys = [key(raw_data) for raw_data in self.data]
+			self.keys[cache_key] = keys
+		return keys
+
+	def invalidate(self):
+		"""
+		Drops the cached keys and orders, e.g. after data got changed directly.
+		"""
+		self.keys = {}
+		self.orders = {}
+
+	def get_order(self, field=None, key=None) -> array:
+		"""
+		Returns all data indices of data in ascending order of their sort keys, elements without a key go last.
+		"""
+		cache_key = key if key is not None else field
+		order = self.orders.get(cache_key)
+		if order is None:
+			keys = self.get_keys(field, key)
+			if None in keys:
+				order = sorted(range(len(keys)), key=lambda index: (keys[index] is None, keys[index]))
+			else:
+				order = sorted(range(len(keys)), key=keys.__getitem__)
+			order = array('q', order)
+			self.orders[cache_key] = order
+		return order
+
+	def sort(self, field=None, key=None, reverse=False):
+		"""
+		Without field and key, the view falls back to the order of data.
+		"""
+		self.sort_field = field
+		self.sort_key = key
+		self.reverse = reverse
+		self.refresh()
+
+	def filter(self, predicate=None, field=None):
+		"""
+		Keeps the elements for which predicate returns True. predicate gets the value of field in 'init_data' if field is
+		given, the record itself otherwise. Passing no predicate removes the filter.
+		"""
+		self.predicate = predicate
+		self.filter_field = field
+		self.refresh()
+
+	def refresh(self):
+		if self.sort_field is None and self.sort_key is None:
+			order = array('q', range(len(self.data)))
+		else:
+			order = self.get_order(self.sort_field, self.sort_key)
+		if self.reverse:
+			order = order[::-1]
+
+		if self.predicate is not None:
+			predicate = self.predicate
+			if self.filter_field is None:
+				data = self.data
+				order = [index for index in order if predicate(data[index])]
+			else:
+				values = self.get_keys(self.filter_field)
+				order = [index for index in order if predicate(values[index])]
+			order = array('q', order)
+		self.indices = order
+
+	def insert(self, data_index, raw_data):
+		length = len(self.indices)
+		if data_index < 0:
+			data_index = max(0, data_index + length)
+		self.data.append(raw_data)
+		self.indices.insert(min(data_index, length), len(self.data) - 1)
+		self.invalidate()
+
+	def append(self, raw_data):
+		self.insert(len(self.indices), raw_data)
+
+	def pop(self, data_index=-1):
+		source_index = self.indices.pop(self._index(data_index))
+		raw_data = self.data.pop(source_index)
+		self.indices = array('q', (index - 1 if index > source_index else index for index in self.indices))
+		self.invalidate()
+		return raw_data
@@ -0,0 +1,177 @@
+from kivy.clock import Clock
+
+from gui_framework.data_containers import SparseData
+
+from typing import List
+from os.path import splitext
+import csv
+
+
+"""
+Streaming loader for delimited text files (csv, tsv) into a GridLayout, see GridLayout.loadDelimited.
+
+The file is parsed lazily with csv.reader and consumed in chunks of chunk_size lines. The first chunk gets appended and
+filled in right away, hence the first screen is visible before the rest of the file has been read. The remaining
+chunks are appended one per frame (Clock.schedule_once), so at no time more than one chunk of parsed lines is held
+besides the data of the grid.
+
+The rows are stored as {'child_type': row_type, 'init_data': {'real_size': ..., 'data': cells}}, where cells is a
+SparseData that only stores the non empty values as
+{'child_type': cell_type, 'init_data': {'real_size': ..., 'wrapped_data': {text_key: value}}}. Empty values are read as
+the empty record of the row (an empty cell_type).
+
+NOTE: The number of columns is given by the longest line read so far. Lines that are longer than all previous ones
+add columns to all rows (see GridLayout.insertColumn), shorter ones are filled with empty cells.
+"""
+
+DELIMITERS = {'.csv': ',', '.tsv': '\t', '.tab': '\t'}
+SNIFF_SIZE = 4096
+
+
+def get_delimiter(file, file_path='') -> str:
+	"""
+	The delimiter is derived from the file extension if possible, otherwise it gets sniffed from the beginning of file
+	(',' if that fails as well). file needs to be seekable in the latter case.
+	"""
+	delimiter = DELIMITERS.get(splitext(file_path)[1].lower())
+	if delimiter is not None:
+		return delimiter
+	sample = file.read(SNIFF_SIZE)
+	file.seek(0)
+	try:
+		return csv.Sniffer().sniff(sample, delimiters=',\t;|').delimiter
+	except csv.Error:
+		return ','
+
+
+def iter_chunks(file, delimiter=',', chunk_size=500):
+	"""
+	Yields the lines of file as lists of (at most chunk_size) lists of values.
+	"""
+	chunk = []
+	for values in csv.reader(file, delimiter=delimiter):
+		chunk.append(values)
+		if len(chunk) >= chunk_size:
+			yield chunk
+			chunk = []
+	if chunk:
+		yield chunk
+
+
+class DelimitedLoader(object):
+	"""
+	Appends the lines of a delimited file to grid chunk by chunk, see the module docstring.
+
+	NOTE: The file stays open until it is read completely or the loader gets cancelled.
+	"""
+	def __init__(self, grid, file_path, row_type, cell_type, delimiter=None, chunk_size=500, text_key='this_text',
+		col_width=100, row_height=30, header=False, encoding='utf-8'):
+		self.grid = grid
+		self.file_path = file_path
+		self.row_type = row_type
+		self.cell_type = cell_type
+		self.delimiter = delimiter
+		self.chunk_size = chunk_size
+		self.text_key = text_key
+		self.col_width = col_width
+		self.row_height = row_height
+		self.header = header
+		self.encoding = encoding
+		self.file = None
+		self.chunks = None
+		self.load_event = None
+		self.loaded_rows = 0
+		self.is_done = False
+
+	def start(self):
+		"""
+		Loads and fills in the first chunk, the remaining ones get scheduled.
+		"""
+		# newline='' lets csv handle line breaks within quoted values
+		self.file = open(self.file_path, newline='', encoding=self.encoding)
+		if self.delimiter is None:
+			self.delimiter = get_delimiter(self.file, self.file_path)
+		self.chunks = iter_chunks(self.file, self.delimiter, self.chunk_size)
+		self.loadChunk()
+		if self.header and self.loaded_rows:
+			self.grid.freezePanes(1, self.grid.frozen_cols)
+		return self
+
+	def loadChunk(self, *args):
+		self.load_event = None
+		if self.is_done:
+			return
+		chunk = next(self.chunks, None)
+		if chunk is None:
+			self.close()
+			return
+		self.appendRows(chunk)
+		self.load_event = Clock.schedule_once(self.loadChunk)
+
+	def loadAll(self):
+		"""
+		Reads the rest of the file at once instead of one chunk per frame.
+		"""
+		self.cancelEvent()
+		while not self.is_done:
+			self.loadChunk()
+			self.cancelEvent()
+
+	def cancelEvent(self):
+		if self.load_event is not None:
+			self.load_event.cancel()
+			self.load_event = None
+
+	def cancel(self):
+		"""
+		Stops loading, the rows loaded so far stay in the grid.
+		"""
+		self.cancelEvent()
+		self.close()
+
+	def close(self):
+		if self.file is not None:
+			self.file.close()
+		self.file = None
+		self.chunks = None
+		self.is_done = True
+
+	def get_empty_cell(self) -> dict:
+		return {'child_type': self.cell_type, 'init_data': {'wrapped_data': {self.text_key: ''}}}
+
+	def get_row_record(self, values: List) -> dict:
+		col_widths = self.grid.col_widths
+		records = {}
+		for col_index, value in enumerate(values):
+			if value:
+				records[col_index] = {
+					'child_type': self.cell_type,
+					'init_data': {
+						'real_size': [col_widths[col_index], self.row_height],
+						'wrapped_data': {self.text_key: value}
+					}
+				}
+		cells = SparseData(len(col_widths), records, self.get_empty_cell())
+		return {'child_type': self.row_type, 'init_data': {'real_size': [col_widths.total(), self.row_height], 'data': cells}}
+
+	def addColumns(self, col_count):
+		grid = self.grid
+		if not len(grid.data):
+			# no rows to update yet
+			grid.col_widths.set_widths(list(grid.col_widths) + [self.col_width] * (col_count - len(grid.col_widths)))
+			return
+		while len(grid.col_widths) < col_count:
+			grid.insertColumn(len(grid.col_widths), self.col_width, child_type=self.cell_type)
+
+	def appendRows(self, chunk: List):
+		grid = self.grid
+		col_count = max(len(values) for values in chunk)
+		if col_count > len(grid.col_widths):
+			self.addColumns(col_count)
+		for values in chunk:
+			grid.row_heights.append(self.row_height)
+			grid.addData(len(grid.data), self.get_row_record(values))
+		self.loaded_rows += len(chunk)
+
+		# only fills in anything if the visible rows end at the end of data
+		grid.fillInChildren()
@@ -0,0 +1,320 @@
+from array import array
+from collections.abc import Mapping
+from io import BytesIO
+from math import isnan
+import json
+import struct
+import sys
+
+
+"""
+Compact binary snapshots of layout state, see BaseLayout.saveSnapshot / loadSnapshot and BaseDesign.saveSnapshot /
+loadSnapshot.
+
+Since data holds the child_type classes themselves, they cannot be persisted as they are. A ChildTypeRegistry maps them
+to ids instead, the same registry (same ids!) has to be used for saving and loading.
+
+Format (little endian):
+	header:  MAGIC, version (H)
+	data:    count (I), type ids (column of H, 0 for empty records), real_size (column of d, 2 per record, NaN if not
+	         set), nested flags (column of B), then per record the remaining fields as length prefixed json and for
+	         nested records their data (recursively)
+	window:  count (I), data indices (column of q), real_pos (column of d, 2 per entry), nested flags (column of B),
+	         then the windows of the nested entries (recursively)
+	state:   the layouts snapshot_attributes as length prefixed json
+
+A design stores the number of its layouts (I) after the header, followed by data, window and state of each layout.
+
+A column is stored as byte length (I) followed by the raw bytes of the array.
+
+NOTE: 'real_pos' and 'anchor' are not stored within the records. Positions are part of the window, anchors get set by
+the layouts when the children are created.
+"""
+
+MAGIC = b'GFLS'
+VERSION = 1
+
+TRANSIENT_KEYS = ('real_pos', 'anchor')
+CHILD_TYPE_KEY = '__child_type__'
+
+
+class ChildTypeRegistry(object):
+	def __init__(self, child_types=[]):
+		self.types = {}
+		self.ids = {}
+		for child_type in child_types:
+			self.register(child_type)
+
+	def register(self, child_type, type_id=None) -> int:
+		"""
+		Ids start at 1, 0 is reserved for empty records. Registering the same class twice returns its existing id.
+		"""
+		if child_type in self.ids:
+			return self.ids[child_type]
+		if type_id is None:
+			type_id = max(self.types, default=0) + 1
+		if type_id in self.types:
+			raise ValueError('type id {} is already registered for {}'.format(type_id, self.types[type_id].__name__))
+		self.types[type_id] = child_type
+		self.ids[child_type] = type_id
+		return type_id
+
+	def get_id(self, child_type) -> int:
+		try:
+			return self.ids[child_type]
+		except KeyError:
+			raise KeyError('{} is not registered, call ChildTypeRegistry.register first'.format(child_type.__name__))
+
+	def get_type(self, type_id):
+		return self.types[type_id]
+
+
+# WRITING
+
+def _write_column(stream, column: array):
+	if sys.byteorder != 'little':
+		column = array(column.typecode, column)
+		column.byteswap()
+	raw = column.tobytes()
+	stream.write(struct.pack('<I', len(raw)))
+	stream.write(raw)
+
+
+def _write_bytes(stream, raw: bytes):
+	stream.write(struct.pack('<I', len(raw)))
+	stream.write(raw)
+
+
+def _encode_value(registry):
+	def encode(value):
+		if isinstance(value, type):
+			return {CHILD_TYPE_KEY: registry.get_id(value)}
+		if isinstance(value, Mapping):
+			return dict(value)
+		if hasattr(value, '__iter__'):
+			# e.g. kivy's ObservableList
+			return list(value)
+		raise TypeError('{} cannot be stored in a snapshot'.format(type(value).__name__))
+	return encode
+
+
+def write_data(stream, data, registry: ChildTypeRegistry):
+	type_ids = array('H')
+	sizes = array('d')
+	nested = array('B')
+	fields = []
+	nested_data = []
+	for raw_data in data:
+		if not raw_data:
+			type_ids.append(0)
+			sizes.extend((float('nan'), float('nan')))
+			nested.append(0)
+			fields.append(b'')
+			continue
+		type_ids.append(registry.get_id(raw_data['child_type']))
+		init_data = raw_data['init_data']
+		real_size = init_data.get('real_size')
+		if real_size is None:
+			sizes.extend((float('nan'), float('nan')))
+		else:
+			sizes.extend((real_size[0], real_size[1]))
+		extra = {}
+		for key, value in init_data.items():
+			if key in TRANSIENT_KEYS or key == 'real_size' or key == 'data':
+				continue
+			extra[key] = value
+		extra_raw = {}
+		for key, value in raw_data.items():
+			if key in TRANSIENT_KEYS or key == 'child_type' or key == 'init_data':
+				continue
+			extra_raw[key] = value
+		if 'data' in init_data:
+			nested.append(1)
+			nested_data.append(init_data['data'])
+		else:
+			nested.append(0)
+		if extra or extra_raw:
+			encoded = json.dumps([extra, extra_raw], separators=(',', ':'), default=_encode_value(registry))
+			fields.append(encoded.encode('utf-8'))
+		else:
+			fields.append(b'')
+
+	stream.write(struct.pack('<I', len(type_ids)))
+	_write_column(stream, type_ids)
+	_write_column(stream, sizes)
+	_write_column(stream, nested)
+	for raw in fields:
+		_write_bytes(stream, raw)
+	for child_data in nested_data:
+		write_data(stream, child_data, registry)
+
+
+def get_window(layout) -> list:
+	"""
+	Returns the visible window of layout as a list of (data_index, real_pos, window of the child or None).
+	"""
+	window = []
+	for child in layout.visible:
+		child_window = None
+		if hasattr(child, 'visible'):
+			child_window = get_window(child)
+		window.append((child.data_index, [child.real_pos[0], child.real_pos[1]], child_window))
+	return window
+
+
+def write_window(stream, window):
+	data_indices = array('q')
+	positions = array('d')
+	nested = array('B')
+	for data_index, real_pos, child_window in window:
+		data_indices.append(data_index)
+		positions.extend(real_pos)
+		nested.append(0 if child_window is None else 1)
+	stream.write(struct.pack('<I', len(data_indices)))
+	_write_column(stream, data_indices)
+	_write_column(stream, positions)
+	_write_column(stream, nested)
+	for data_index, real_pos, child_window in window:
+		if child_window is not None:
+			write_window(stream, child_window)
+
+
+def write_header(stream):
+	stream.write(MAGIC)
+	stream.write(struct.pack('<H', VERSION))
+
+
+def write_state(stream, layout, registry: ChildTypeRegistry):
+	state = {name: getattr(layout, name) for name in layout.snapshot_attributes}
+	encoded = json.dumps(state, separators=(',', ':'), default=_encode_value(registry))
+	_write_bytes(stream, encoded.encode('utf-8'))
+
+
+def write_layout(stream, layout, registry: ChildTypeRegistry):
+	layout.updateDataFromVisible()
+	write_data(stream, layout.data, registry)
+	write_window(stream, get_window(layout))
+	write_state(stream, layout, registry)
+
+
+def dumps(layout, registry: ChildTypeRegistry) -> bytes:
+	stream = BytesIO()
+	write_header(stream)
+	write_layout(stream, layout, registry)
+	return stream.getvalue()
+
+
+def dumps_design(design, registry: ChildTypeRegistry) -> bytes:
+	stream = BytesIO()
+	write_header(stream)
+	stream.write(struct.pack('<I', len(design.layouts)))
+	for layout in design.layouts:
+		write_layout(stream, layout, registry)
+	return stream.getvalue()
+
+
+# READING
+
+def _read(stream, size) -> bytes:
+	raw = stream.read(size)
+	if len(raw) != size:
+		raise ValueError('snapshot is truncated')
+	return raw
+
+
+def _read_count(stream) -> int:
+	return struct.unpack('<I', _read(stream, 4))[0]
+
+
+def _read_column(stream, typecode) -> array:
+	column = array(typecode)
+	column.frombytes(_read(stream, _read_count(stream)))
+	if sys.byteorder != 'little':
+		column.byteswap()
+	return column
+
+
+def _decode_value(registry):
+	def decode(value):
+		if len(value) == 1 and CHILD_TYPE_KEY in value:
+			return registry.get_type(value[CHILD_TYPE_KEY])
+		return value
+	return decode
+
+
+def read_data(stream, registry: ChildTypeRegistry) -> list:
+	count = _read_count(stream)
+	type_ids = _read_column(stream, 'H')
+	sizes = _read_column(stream, 'd')
+	nested = _read_column(stream, 'B')
+	decode = _decode_value(registry)
+	data = []
+	for i in range(count):
+		raw = _read(stream, _read_count(stream))
+		if not type_ids[i]:
+			data.append({})
+			continue
+		init_data = {}
+		raw_data = {'child_type': registry.get_type(type_ids[i]), 'init_data': init_data}
+		if not isnan(sizes[2 * i]):
+			init_data['real_size'] = [sizes[2 * i], sizes[2 * i + 1]]
+		if raw:
+			extra, extra_raw = json.loads(raw.decode('utf-8'), object_hook=decode)
+			init_data.update(extra)
+			raw_data.update(extra_raw)
+		data.append(raw_data)
+	for i in range(count):
+		if nested[i]:
+			data[i]['init_data']['data'] = read_data(stream, registry)
+	return data
+
+
+def read_window(stream) -> list:
+	count = _read_count(stream)
+	data_indices = _read_column(stream, 'q')
+	positions = _read_column(stream, 'd')
+	nested = _read_column(stream, 'B')
+	window = []
+	for i in range(count):
+		child_window = None
+		if nested[i]:
+			child_window = read_window(stream)
+		window.append((data_indices[i], [positions[2 * i], positions[2 * i + 1]], child_window))
+	return window
+
+
+def read_header(stream):
+	if _read(stream, len(MAGIC)) != MAGIC:
+		raise ValueError('not a layout snapshot')
+	version = struct.unpack('<H', _read(stream, 2))[0]
+	if version != VERSION:
+		raise ValueError('unsupported snapshot version {}'.format(version))
+
+
+def read_state(stream, registry: ChildTypeRegistry) -> dict:
+	return json.loads(_read(stream, _read_count(stream)).decode('utf-8'), object_hook=_decode_value(registry))
+
+
+def read_layout(stream, registry: ChildTypeRegistry):
+	"""
+	Returns data, window and state of a layout.
+	"""
+	data = read_data(stream, registry)
+	window = read_window(stream)
+	state = read_state(stream, registry)
+	return data, window, state
+
+
+def loads(raw: bytes, registry: ChildTypeRegistry):
+	stream = BytesIO(raw)
+	read_header(stream)
+	return read_layout(stream, registry)
+
+
+def loads_design(raw: bytes, registry: ChildTypeRegistry) -> list:
+	"""
+	Returns (data, window, state) for each layout of a design.
+	"""
+	stream = BytesIO(raw)
+	read_header(stream)
+	return [read_layout(stream, registry) for i in range(_read_count(stream))]
@@ -11,6 +11,7 @@ from kivy.properties import ListProperty, ObjectProperty, NumericProperty, Boole
 
 class TestWidget(ChildWidget):
 	this_text = StringProperty('')
+	dirty_properties = ChildWidget.dirty_properties + ['this_text']
 
 	def updatePos(self, delta):
 		super(TestWidget, self).updatePos(delta)
@@ -77,6 +78,7 @@ class TestDesign(BaseDesign):
 # testing grid
 
 class TestCell(TestWidget, Cell):
+	dirty_properties = Cell.dirty_properties
 	def to_data(self) -> dict:
 		test_data = TestWidget.to_data(self)
 		cell_data = Cell.to_data(self)
@@ -0,0 +1,99 @@
+from kivy.core.text import Label as CoreLabel, DEFAULT_FONT
+
+from collections import OrderedDict
+from typing import List
+
+
+"""
+Text measurement without widgets. A core label (kivy.core.text.Label) per font and font size measures the extents of a
+text without rendering it, the results are kept in an LRU cache keyed by (font_name, font_size, text). Hence changing
+the font size of a text heavy layout only measures every distinct text once per font size.
+
+The module level instance text_metrics is shared by FontLayout, BaseText and CellWrapper.
+"""
+
+LINE_HEIGHT_TEXT = 'H'
+
+
+class TextMetrics(object):
+	"""
+	max_size limits the number of cached measurements, the least recently used ones get evicted.
+
+	NOTE: Multiline texts are measured line by line, their width is the width of the widest line and their height the
+	sum of the line heights.
+	"""
+	def __init__(self, max_size=4096):
+		self.max_size = max_size
+		self.sizes = OrderedDict()
+		self.labels = {}
+		self.hits = 0
+		self.misses = 0
+
+	def __len__(self):
+		return len(self.sizes)
+
+	def get_label(self, font_name, font_size) -> CoreLabel:
+		key = (font_name, font_size)
+		label = self.labels.get(key)
+		if label is None:
+			label = CoreLabel(font_name=font_name, font_size=font_size)
+			self.labels[key] = label
+		return label
+
+	def get_extents(self, text, font_name, font_size) -> tuple:
+		label = self.get_label(font_name, font_size)
+		width = 0
+		height = 0
+		for line in text.split('\n'):
+			# an empty line still takes up one line height
+			line_width, line_height = label.get_extents(line or ' ')
+			if line and line_width > width:
+				width = line_width
+			height += line_height
+		return width, height
+
+	def measure(self, text, font_size, font_name=DEFAULT_FONT) -> tuple:
+		"""
+		Returns the (width, height) of text.
+		"""
+		key = (font_name, font_size, text)
+		size = self.sizes.get(key)
+		if size is not None:
+			self.hits += 1
+			self.sizes.move_to_end(key)
+			return size
+		self.misses += 1
+		size = self.get_extents(text, font_name, font_size)
+		self.sizes[key] = size
+		if len(self.sizes) > self.max_size:
+			self.sizes.popitem(last=False)
+		return size
+
+	def measure_many(self, texts: List, font_size, font_name=DEFAULT_FONT) -> list:
+		"""
+		Returns the (width, height) of each of texts, every distinct text gets measured (or looked up) only once.
+		"""
+		sizes = {}
+		for text in texts:
+			if text not in sizes:
+				sizes[text] = self.measure(text, font_size, font_name)
+		return [sizes[text] for text in texts]
+
+	def line_height(self, font_size, font_name=DEFAULT_FONT):
+		return self.measure(LINE_HEIGHT_TEXT, font_size, font_name)[1]
+
+	def clear(self):
+		self.sizes = OrderedDict()
+		self.labels = {}
+
+	def stats(self) -> dict:
+		requests = self.hits + self.misses
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'hit_rate': self.hits / requests if requests else 0,
+			'cached': len(self)
+		}
+
+
+text_metrics = TextMetrics()
@@ -1,4 +1,13 @@
 from typing import List
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+
+try:
+	import numpy
+except ImportError:
+	# optional, see group_max
+	numpy = None
 
 
 class Touch(object):
@@ -33,3 +42,294 @@ class RealWidget(object):
 	def __init__(self, real_pos: List, real_size: List):
 		self.real_pos = real_pos
 		self.real_size = real_size
+
+
+class OffsetIndex(object):
+	"""
+	Prefix sums over the extents (real_size along the layouts orientation) of the elements of BaseLayout.data, stored as
+	a Fenwick tree. offset -> data_index and data_index -> offset are both O(log n).
+
+	NOTE: Updating an extent and appending are O(log n). Inserting or removing in the middle shifts all following
+	elements, hence the tree gets rebuilt from the changed index onwards (O(n), but without any dict lookups).
+	"""
+	def __init__(self, extents: List = []):
+		self.extents = [float(extent) for extent in extents]
+		self.tree = [0.0] * (len(self.extents) + 1)
+		self.rebuild()
+
+	def __len__(self):
+		return len(self.extents)
+
+	def rebuild(self, start=0):
+		"""
+		Linear construction of the tree; every node adds itself to its parent. Nodes up to start only cover elements
+		before start, hence they stay untouched.
+		"""
+		tree = self.tree
+		size = len(tree)
+		for i in range(start + 1, size):
+			tree[i] = self.extents[i - 1]
+		for i in range(1, size):
+			parent = i + (i & -i)
+			if start < parent < size:
+				tree[parent] += tree[i]
+
+	def offset(self, data_index):
+		"""
+		Returns the summed extents of all elements before data_index.
+		"""
+		result = 0.0
+		tree = self.tree
+		i = data_index
+		while i > 0:
+			result += tree[i]
+			i -= i & -i
+		return result
+
+	def total(self):
+		return self.offset(len(self.extents))
+
+	def extent(self, data_index):
+		return self.extents[data_index]
+
+	def update(self, data_index, extent):
+		extent = float(extent)
+		delta = extent - self.extents[data_index]
+		if not delta:
+			return
+		self.extents[data_index] = extent
+		tree = self.tree
+		i = data_index + 1
+		while i < len(tree):
+			tree[i] += delta
+			i += i & -i
+
+	def append(self, extent):
+		extent = float(extent)
+		i = len(self.tree)
+		self.extents.append(extent)
+		# a node covers the elements (i - lowbit(i), i]
+		self.tree.append(extent + self.offset(i - 1) - self.offset(i - (i & -i)))
+
+	def insert(self, data_index, extent):
+		if data_index >= len(self.extents):
+			self.append(extent)
+			return
+		self.extents.insert(data_index, float(extent))
+		self.tree.append(0.0)
+		self.rebuild(data_index)
+
+	def pop(self, data_index):
+		extent = self.extents.pop(data_index)
+		self.tree.pop()
+		self.rebuild(data_index)
+		return extent
+
+	def find(self, offset):
+		"""
+		Returns the data_index of the element that covers offset, i.e. offset(data_index) <= offset < offset(data_index + 1).
+		Offsets beyond the total extent return len(self), negative offsets return 0.
+		"""
+		if offset < 0:
+			return 0
+		tree = self.tree
+		size = len(tree)
+		position = 0
+		remaining = offset
+		step = 1
+		while step * 2 < size:
+			step *= 2
+		while step:
+			next_position = position + step
+			if next_position < size and tree[next_position] <= remaining:
+				position = next_position
+				remaining -= tree[next_position]
+			step //= 2
+		return position
+
+
+class RecyclePool(object):
+	"""
+	Stores removed children per child_type so that they can be rebound to new data instead of being instantiated again.
+	A pool can be shared across layouts (e.g. all rows of a grid).
+
+	max_size limits the number of stored children per child_type. Children pushed onto a full pool get discarded.
+	"""
+	def __init__(self, max_size=32):
+		self.max_size = max_size
+		self.pools = {}
+		self.hits = 0
+		self.misses = 0
+		self.discarded = 0
+
+	def __len__(self):
+		return sum(len(pool) for pool in self.pools.values())
+
+	def pop(self, child_type):
+		"""
+		Returns a stored child of child_type or None if there is none.
+		"""
+		pool = self.pools.get(child_type)
+		if pool:
+			self.hits += 1
+			return pool.pop()
+		self.misses += 1
+		return None
+
+	def push(self, child):
+		pool = self.pools.setdefault(type(child), [])
+		if len(pool) >= self.max_size:
+			self.discarded += 1
+			return False
+		pool.append(child)
+		return True
+
+	def clear(self):
+		self.pools = {}
+
+	def stats(self) -> dict:
+		requests = self.hits + self.misses
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'discarded': self.discarded,
+			'hit_rate': self.hits / requests if requests else 0,
+			'pooled': len(self)
+		}
+
+
+class KeyView(object):
+	"""
+	Read-only view of a sequence with key applied to each element. This way bisect works on e.g. the positions of the
+	visible children without building a list of them first.
+	"""
+	def __init__(self, sequence, key):
+		self.sequence = sequence
+		self.key = key
+
+	def __len__(self):
+		return len(self.sequence)
+
+	def __getitem__(self, index):
+		return self.key(self.sequence[index])
+
+
+class IntervalIndex(object):
+	"""
+	Stabbing queries over intervals (start, end, item). The intervals are sorted by start together with the running
+	maximum of their ends, hence a query only walks back from the bisected position as long as earlier intervals can
+	still reach the queried value.
+
+	NOTE: The index is static, build a new one whenever the intervals change.
+	"""
+	def __init__(self, intervals: List = []):
+		self.intervals = sorted(intervals, key=lambda interval: interval[0])
+		self.starts = [interval[0] for interval in self.intervals]
+		self.max_ends = []
+		max_end = None
+		for start, end, item in self.intervals:
+			max_end = end if max_end is None else max(max_end, end)
+			self.max_ends.append(max_end)
+
+	def __len__(self):
+		return len(self.intervals)
+
+	def query(self, value) -> list:
+		"""
+		Returns the items of all intervals with start < value < end.
+		"""
+		items = []
+		i = bisect_left(self.starts, value) - 1
+		while i >= 0 and self.max_ends[i] > value:
+			start, end, item = self.intervals[i]
+			if end > value:
+				items.append(item)
+			i -= 1
+		return items
+
+
+class ColumnModel(object):
+	"""
+	Column widths of a grid, shared by reference by the grid and all of its rows. Every change increments version, the
+	prefix offsets (x of each column relative to the row) are cached and rebuilt lazily once per version. Hence a width
+	change gets published once for all rows and each row resolves the x of a cell in O(1).
+
+	Behaves like a list of widths otherwise.
+	"""
+	def __init__(self, widths: List = []):
+		self.widths = list(widths)
+		self.version = 0
+		self.offsets = None
+
+	def __len__(self):
+		return len(self.widths)
+
+	def __iter__(self):
+		return iter(self.widths)
+
+	def __getitem__(self, col_index):
+		return self.widths[col_index]
+
+	def __setitem__(self, col_index, width):
+		self.widths[col_index] = width
+		self.changed()
+
+	def __repr__(self):
+		return 'ColumnModel({}, version={})'.format(self.widths, self.version)
+
+	def changed(self):
+		self.version += 1
+		self.offsets = None
+
+	def insert(self, col_index, width):
+		self.widths.insert(col_index, width)
+		self.changed()
+
+	def append(self, width):
+		self.widths.append(width)
+		self.changed()
+
+	def pop(self, col_index=-1):
+		width = self.widths.pop(col_index)
+		self.changed()
+		return width
+
+	def set_widths(self, widths: List):
+		self.widths = list(widths)
+		self.changed()
+
+	def get_offsets(self) -> list:
+		if self.offsets is None:
+			self.offsets = [0] + list(accumulate(self.widths))
+		return self.offsets
+
+	def offset(self, col_index):
+		"""
+		Returns the summed widths of all columns before col_index.
+		"""
+		return self.get_offsets()[col_index]
+
+	def total(self):
+		return self.get_offsets()[-1]
+
+
+def group_max(keys: array, values: array, size, initial: List = None) -> list:
+	"""
+	Returns the maximum of values per key (0 <= key < size) in one pass, keys without any value keep their entry of
+	initial (0 if None). keys and values are arrays of the same length (e.g. array('q') and array('d')).
+
+	NOTE: With numpy available the reduction is vectorized (numpy.maximum.at on the buffers of the arrays), otherwise it
+	falls back to a plain loop.
+	"""
+	if initial is None:
+		initial = [0] * size
+	if numpy is not None:
+		result = numpy.full(size, -numpy.inf)
+		numpy.maximum.at(result, numpy.frombuffer(keys, dtype=numpy.int64), numpy.frombuffer(values, dtype=numpy.float64))
+		return numpy.where(numpy.isneginf(result), numpy.asarray(initial, dtype=numpy.float64), result).tolist()
+
+	result = [None] * size
+	for key, value in zip(keys, values):
+		if result[key] is None or value > result[key]:
+			result[key] = value
+	return [initial[key] if value is None else value for key, value in enumerate(result)]